@@ -0,0 +1,53 @@
+"""
+Derived properties: recomputing them in `on update` every tick against `bind`, which recomputes
+only when an input changed.
+
+N circles get their radius from a `scale` that changes once every 30 ticks.
+Run from the repository root: python benchmarks/bindings.py [N ...]
+"""
+import sys
+
+from harness import time_ticks
+
+SETUP = """
+let n = {n};
+let scale = 1;
+let frame = 0;
+let shapes = [];
+for i in range(0, n) {{
+    let circle = Circle{{ radius: 1, color: rgb(0, 0, 0), baseRadius: 5 + i % 7 }};
+    push(shapes, circle);
+    draw((i, i), circle);
+}}
+"""
+
+UPDATE = """
+on update(dt) {
+    frame = frame + 1;
+    if (frame % 30 == 0) { scale = scale + 0.1; }
+    for shape in shapes { shape.radius = shape.baseRadius * scale; }
+}
+"""
+
+BIND = """
+for shape in shapes { bind shape.radius = shape.baseRadius * scale; }
+
+on update(dt) {
+    frame = frame + 1;
+    if (frame % 30 == 0) { scale = scale + 0.1; }
+}
+"""
+
+TICKS = 60
+
+def main(sizes):
+    print(f"{'shapes':>10} {'update ms/tick':>16} {'bind ms/tick':>14} {'recomputes/tick':>17} {'speedup':>9}")
+    for n in sizes:
+        update_time, _ = time_ticks(SETUP.format(n=n) + UPDATE, TICKS)
+        bind_time, visitor = time_ticks(SETUP.format(n=n) + BIND, TICKS)
+        recomputes = visitor.bindings.recomputes_in_ticks / TICKS
+        print(f"{n:>10} {update_time * 1000:>16.2f} {bind_time * 1000:>14.2f} {recomputes:>17.1f} "
+              f"{update_time / bind_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [50, 200, 500])
@@ -0,0 +1,35 @@
+"""
+Shared part of the benchmarks: runs a script headless and times its update ticks.
+Each benchmark only supplies the scripts it compares.
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from interpreter import CustomInterpreterVisitor, parse_source, setup_builtin_functions
+from headless import HeadlessGraphicsController
+
+def time_ticks(source, ticks, dt=1 / 60):
+    """
+    Runs the top-level code of `source`, with its output silenced, and then `ticks` update ticks.
+    Returns (mean seconds per tick, visitor), so benchmarks can read the script's state afterwards.
+    """
+    tree = parse_source(source)
+    if tree is None:
+        raise SyntaxError("Benchmark script failed to parse")
+
+    graphics_controller = HeadlessGraphicsController()
+    visitor = CustomInterpreterVisitor(graphics_controller)
+    graphics_controller.add_visitor(visitor)
+    setup_builtin_functions(visitor, graphics_controller)
+    with contextlib.redirect_stdout(io.StringIO()):
+        visitor.visit(tree)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        graphics_controller.tick(dt)
+    return (time.perf_counter() - start) / ticks, visitor
@@ -0,0 +1,57 @@
+"""
+Startup cost of the interpreter core, measured with `python -X importtime`.
+
+Importing the interpreter must not load any graphics module (arcade, pyglet, OpenGL, PIL),
+and the cumulative import time must fit in the budget. Exits with status 1 otherwise.
+Run from the repository root: python benchmarks/import_time.py [--budget MS] [--runs N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+MODULES = ['interpreter', 'headless', 'batch']
+GRAPHICAL = ('arcade', 'pyglet', 'OpenGL', 'PIL')
+
+def measure(module):
+    """Returns (cumulative import time in ms, names of all imported modules) for one fresh interpreter."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SRC, capture_output=True, text=True, check=True)
+
+    total_us = 0
+    imported = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.append(name.strip())
+        if name.strip() == module:
+            total_us = int(cumulative)
+    return total_us / 1000, imported
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the interpreter core starts fast and without graphics.")
+    parser.add_argument("--budget", type=float, default=250, help="allowed cumulative import time in ms")
+    parser.add_argument("--runs", type=int, default=5, help="the fastest of this many runs is reported")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'module':>12} {'import ms':>10} {'graphical modules':>20}")
+    for module in MODULES:
+        runs = [measure(module) for _ in range(args.runs)]
+        best = min(time_ms for time_ms, _ in runs)
+        graphical = sorted({name.split('.')[0] for name in runs[0][1] if name.split('.')[0] in GRAPHICAL})
+
+        print(f"{module:>12} {best:>10.1f} {', '.join(graphical) or '-':>20}")
+        failed |= best > args.budget or bool(graphical)
+
+    if failed:
+        print(f"FAILED: over the {args.budget:.0f} ms budget or a graphical module was imported")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Keyed lookup: Map against the parallel-array pattern scripts had to use before.
+
+Both scripts store N entities by id and look every one of them up once per tick.
+Run from the repository root: python benchmarks/map_lookup.py [N ...]
+"""
+import sys
+
+from harness import time_ticks
+
+SETUP = """
+let n = {n};
+let ids = [];
+let entities = [];
+let byId = Map{{}};
+let i = 0;
+while (i < n) {{
+    push(ids, i * 7);
+    push(entities, i);
+    byId[i * 7] = i;
+    i = i + 1;
+}}
+"""
+
+LIST_LOOKUP = """
+proc find(id) {
+    let j = 0;
+    while (j < len(ids)) {
+        if (ids[j] == id) { return entities[j]; }
+        j = j + 1;
+    }
+    return -1;
+}
+
+on update(dt) {
+    let total = 0;
+    for k in range(0, n) { total = total + find(k * 7); }
+}
+"""
+
+MAP_LOOKUP = """
+on update(dt) {
+    let total = 0;
+    for k in range(0, n) { total = total + byId[k * 7]; }
+}
+"""
+
+TICKS = 5
+
+def main(sizes):
+    print(f"{'entities':>10} {'list ms/tick':>14} {'map ms/tick':>13} {'speedup':>9}")
+    for n in sizes:
+        list_time, _ = time_ticks(SETUP.format(n=n) + LIST_LOOKUP, TICKS)
+        map_time, _ = time_ticks(SETUP.format(n=n) + MAP_LOOKUP, TICKS)
+        print(f"{n:>10} {list_time * 1000:>14.2f} {map_time * 1000:>13.2f} {list_time / map_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50, 100])
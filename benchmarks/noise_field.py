@@ -0,0 +1,53 @@
+"""
+Per-element trigonometry and noise: an interpreted loop calling the builtin once per element
+against a single call on the whole array of coordinates.
+
+Every tick both scripts compute sin and Perlin noise for N points.
+Run from the repository root: python benchmarks/noise_field.py [N ...]
+"""
+import sys
+
+from harness import time_ticks
+
+SETUP = """
+let n = {n};
+let xs = [];
+let i = 0;
+while (i < n) {{
+    push(xs, i * 0.1);
+    i = i + 1;
+}}
+let t = 0;
+"""
+
+LOOP = """
+on update(dt) {
+    t = t + dt;
+    let waves = [];
+    let heights = [];
+    for k in range(0, n) {
+        push(waves, sin(xs[k]));
+        push(heights, perlin(xs[k], t));
+    }
+}
+"""
+
+ARRAY = """
+on update(dt) {
+    t = t + dt;
+    let waves = sin(xs);
+    let heights = perlin(xs, t);
+}
+"""
+
+TICKS = 5
+
+def main(sizes):
+    print(f"{'points':>10} {'loop ms/tick':>14} {'array ms/tick':>15} {'speedup':>9}")
+    for n in sizes:
+        loop_time, _ = time_ticks(SETUP.format(n=n) + LOOP, TICKS)
+        array_time, _ = time_ticks(SETUP.format(n=n) + ARRAY, TICKS)
+        print(f"{n:>10} {loop_time * 1000:>14.2f} {array_time * 1000:>15.2f} {loop_time / array_time:>8.1f}x")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 1000])
@@ -0,0 +1,62 @@
+"""
+Static layer bookkeeping: per-frame cost of `Scene.refresh_static` next to a growing number
+of still shapes, with a few moving ones and the first still shape changed once.
+
+Every frame also checks that the scene is drawn in the order shapes were added
+(cached entries first, then the dynamic ones), and exits with an error if it isn't.
+Run from the repository root: python benchmarks/static_layers.py [N ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from scene import Scene
+from shape import Circle, Rectangle
+from values import Vec2
+
+MOVING = 50
+STATIC_AFTER = 30
+FRAMES = 200
+# the first still shape changes at this frame, which takes it and everything after it out of the cache
+CHANGE_AT = 60
+
+def draw_order(layer):
+    return sorted(layer.static) + list(layer.dynamic)
+
+def time_frames(n):
+    scene = Scene()
+    early = Rectangle(10, 10, (255, 0, 0))
+    scene.add(Vec2(0, 0), early)
+    for i in range(n):
+        scene.add(Vec2(i % 800, i // 800), Circle(radius=2, color=(0, 0, 0)))
+    movers = [Vec2(0, 0) for _ in range(MOVING)]
+    for point in movers:
+        scene.add(point, Circle(radius=2, color=(0, 0, 255)))
+
+    layer = scene.layers[0]
+    total = 0
+    for frame in range(FRAMES):
+        for point in movers:
+            point.x = frame
+        if frame == CHANGE_AT:
+            early.color = (0, 255, 0, 255)
+
+        start = time.perf_counter()
+        scene.refresh_static(STATIC_AFTER)
+        total += time.perf_counter() - start
+
+        order = draw_order(layer)
+        if order != sorted(order):
+            sys.exit(f"Frame {frame}: shapes are not drawn in the order they were added")
+    return total / FRAMES, len(layer.static)
+
+def main(sizes):
+    print(f"{'still shapes':>13} {'refresh ms/frame':>18} {'cached':>8}")
+    for n in sizes:
+        frame_time, cached = time_frames(n)
+        print(f"{n:>13} {frame_time * 1000:>18.3f} {cached:>8}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -15,6 +15,7 @@ statement: functionDefinition
          | breakStatement
          | continueStatement
          | setStatement
+         | bindStatement
          | forStatement
          | eventHandler
          ;
@@ -42,6 +43,8 @@ continueStatement: CONTINUE SEMI;
 
 setStatement: SET IDENTIFIER expression SEMI;
 
+bindStatement: BIND assignmentTarget ASSIGN expression SEMI;
+
 ifStatement: IF LPAREN expression RPAREN statement (ELSE statement)?;
 
 whileStatement: WHILE LPAREN expression RPAREN statement;
@@ -77,6 +80,7 @@ atom
     | LPAREN expression RPAREN
     | shapeLiteral
     | arrayLiteral
+    | mapLiteral
     | listComprehension
     ;
 
@@ -97,6 +101,18 @@ arrayLiteral
     : LBRACKET argumentList? RBRACKET
     ;
 
+mapLiteral
+    : MAP LBRACE mapEntryList? RBRACE
+    ;
+
+mapEntryList
+    : mapEntry (COMMA mapEntry)*
+    ;
+
+mapEntry
+    : key=expression COLON value=expression
+    ;
+
 shapeLiteral
     : rectangleLiteral
     | circleLiteral
@@ -153,6 +169,7 @@ AND: 'and';
 OR: 'or';
 NOT: 'not';
 SET: 'set';
+BIND: 'bind';
 RGB: 'rgb';
 FOR: 'for';
 IN: 'in';
@@ -162,6 +179,7 @@ RECTANGLE: 'Rectangle';
 CIRCLE: 'Circle';
 TRIANGLE: 'Triangle';
 LINE: 'Line';
+MAP: 'Map';
 
 // Operators and Punctuation
 ASSIGN: '=';
@@ -0,0 +1,104 @@
+import gc
+import time
+
+# generation 1 is collected every this many ticks, generation 2 (after freezing: everything
+# created while the animation runs and survived two collections) every FULL_COLLECT_TICKS
+GEN1_COLLECT_TICKS = 60
+FULL_COLLECT_TICKS = 3600
+
+# objects the interpreter creates for scripts, counted where they are created
+ALLOCATION_KINDS = ('scopes', 'points', 'colors', 'arrays', 'maps')
+
+class AllocationTracker:
+    """
+    Per-tick allocation accounting and, with `frame_gc`, frame-aligned garbage collection.
+
+    The interpreter adds to `counts` every time it creates a scope, point, colour, array
+    or map, so the counts are gross: a scope created and dropped within a tick still counts,
+    a scope reused from the pool doesn't. With `trace_memory`, tracemalloc also reports the
+    peak memory allocated on top of what was live when a tick started, which covers every
+    other short-lived object too; it slows the interpreter down, so it is opt-in.
+
+    With `frame_gc`, after the top-level code of a script finishes, `freeze` moves every
+    live object into the permanent generation and turns off automatic collection. From then
+    on the collector only runs between ticks (`end_tick`), where a pause can't split a frame.
+    """
+
+    def __init__(self, frame_gc=False, trace_memory=False):
+        self.frame_gc = frame_gc
+        self.trace_memory = trace_memory
+        self.counts = dict.fromkeys(ALLOCATION_KINDS, 0)
+        self.ticks = 0
+        self.totals = dict.fromkeys(ALLOCATION_KINDS, 0)
+        self.maxima = dict.fromkeys(ALLOCATION_KINDS, 0)
+        self.total_peak = 0
+        self.max_peak = 0
+        self.gc_time = 0.0
+        self._start_counts = None
+        self._start_memory = 0
+        self._frozen = False
+
+        # imported only when asked for, it adds to the start-up time of every run otherwise
+        self._tracemalloc = None
+        if trace_memory:
+            import tracemalloc
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def freeze(self):
+        if not self.frame_gc:
+            return
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        self._frozen = True
+
+    def release(self):
+        if self._frozen:
+            gc.unfreeze()
+            gc.enable()
+            self._frozen = False
+        if self._tracemalloc is not None and self._tracemalloc.is_tracing():
+            self._tracemalloc.stop()
+
+    def begin_tick(self):
+        self._start_counts = dict(self.counts)
+        if self._tracemalloc is not None:
+            self._tracemalloc.reset_peak()
+            self._start_memory = self._tracemalloc.get_traced_memory()[0]
+
+    def end_tick(self):
+        if self._tracemalloc is not None:
+            peak = self._tracemalloc.get_traced_memory()[1] - self._start_memory
+            self.total_peak += peak
+            self.max_peak = max(self.max_peak, peak)
+
+        self.ticks += 1
+        for kind, count in self.counts.items():
+            allocated = count - self._start_counts[kind]
+            self.totals[kind] += allocated
+            self.maxima[kind] = max(self.maxima[kind], allocated)
+
+        if self._frozen:
+            start = time.perf_counter()
+            if self.ticks % FULL_COLLECT_TICKS == 0:
+                gc.collect(2)
+            elif self.ticks % GEN1_COLLECT_TICKS == 0:
+                gc.collect(1)
+            else:
+                gc.collect(0)
+            self.gc_time += time.perf_counter() - start
+
+    def summary(self):
+        if self.ticks == 0:
+            return "Allocations: no ticks recorded."
+
+        lines = [f"Allocations over {self.ticks} ticks (per tick, max):"]
+        for kind in ALLOCATION_KINDS:
+            lines.append(f"  {kind}: {self.totals[kind] / self.ticks:.1f} (max {self.maxima[kind]})")
+        if self.trace_memory:
+            lines.append(f"  peak memory: {self.total_peak / self.ticks / 1024:.1f} KiB (max {self.max_peak / 1024:.1f} KiB)")
+        if self.frame_gc:
+            lines.append(f"  GC: {self.gc_time * 1000 / self.ticks:.3f} ms")
+        return "\n".join(lines)
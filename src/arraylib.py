@@ -0,0 +1,114 @@
+"""
+Native array functions. Each one runs as a single builtin call instead of an interpreted loop;
+n is the length of the array, k the number of elements copied or added.
+
+Functions taking a proc get a `call(proc, *args)` callable from the interpreter as their first argument.
+"""
+
+def _check_array(arr):
+    if not isinstance(arr, list):
+        raise TypeError(f"expected an array, got {type(arr).__name__}")
+
+def _check_index(arr, index, allow_end=False):
+    if not isinstance(index, int):
+        raise TypeError(f"array index must be an integer, not {type(index).__name__}")
+    size = len(arr) + 1 if allow_end else len(arr)
+    if not -size <= index < size:
+        raise IndexError(f"array index {index} out of bounds (length {len(arr)})")
+
+def _check_not_empty(arr):
+    _check_array(arr)
+    if not arr:
+        raise ValueError("array is empty")
+
+def sort(call, arr, key=None):
+    """Sorts in place, stable. O(n log n) comparisons, plus n calls of `key`."""
+    _check_array(arr)
+    if key is None:
+        arr.sort()
+    else:
+        arr.sort(key=lambda item: call(key, item))
+
+def slice_array(arr, start, end=None):
+    """New array with the elements in [start, end), negative indices count from the end. O(k)."""
+    _check_array(arr)
+    return arr[start:end]
+
+def extend(arr, other):
+    """Appends all elements of `other`. O(k)."""
+    _check_array(arr)
+    arr.extend(other)
+
+def pop(arr, index=-1):
+    """Removes and returns an element, the last one by default. O(1) at the end, O(n) elsewhere."""
+    _check_not_empty(arr)
+    _check_index(arr, index)
+    return arr.pop(index)
+
+def insert(arr, index, value):
+    """Inserts `value` before `index`, an index equal to the length appends. O(n)."""
+    _check_array(arr)
+    _check_index(arr, index, allow_end=True)
+    arr.insert(index, value)
+
+def remove_at(arr, index):
+    """Removes and returns the element at `index`, keeping the order of the rest. O(n)."""
+    _check_array(arr)
+    _check_index(arr, index)
+    return arr.pop(index)
+
+def swap_remove(arr, index):
+    """Removes and returns the element at `index` by moving the last element into its place. O(1)."""
+    _check_array(arr)
+    _check_index(arr, index)
+    if index < 0:
+        index += len(arr)
+    last = arr.pop()
+    if index == len(arr):
+        return last
+    removed = arr[index]
+    arr[index] = last
+    return removed
+
+def index_of(arr, value):
+    """Index of the first element equal to `value`, -1 if there is none. O(n)."""
+    _check_array(arr)
+    for i, item in enumerate(arr):
+        if item == value:
+            return i
+    return -1
+
+def reverse(arr):
+    """Reverses in place. O(n)."""
+    _check_array(arr)
+    arr.reverse()
+
+def fill(arr, value):
+    """Sets every element to `value`. O(n)."""
+    _check_array(arr)
+    arr[:] = [value] * len(arr)
+
+def filter_in_place(call, arr, predicate):
+    """Keeps only the elements for which `predicate` is true, in their order. O(n) calls of `predicate`."""
+    _check_array(arr)
+    arr[:] = [item for item in arr if call(predicate, item)]
+
+def sum_array(arr):
+    """Sum of the elements, 0 for an empty array. O(n)."""
+    _check_array(arr)
+    return sum(arr)
+
+def min_array(arr):
+    """Smallest element. O(n)."""
+    _check_not_empty(arr)
+    return min(arr)
+
+def max_array(arr):
+    """Largest element. O(n)."""
+    _check_not_empty(arr)
+    return max(arr)
+
+def argmin(arr):
+    """Index of the first smallest element. O(n)."""
+    _check_not_empty(arr)
+    return min(range(len(arr)), key=arr.__getitem__)
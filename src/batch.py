@@ -0,0 +1,200 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import resource
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from interpreter import (CustomInterpreterVisitor, InterpreterRuntimeError, parse_file, parse_source,
+                         setup_builtin_functions)
+from headless import HeadlessGraphicsController
+from shape import Shape
+from values import Map, Vec2
+
+# parsed once in every worker, so the ANTLR prediction caches are warm before the first real script
+WARMUP_SCRIPT = """
+let a = [i * 2 for i in range(0, 3) if (i != 1)];
+let p = (1, 2.5);
+let c = Circle{ radius: 1, color: rgb(1, 2, 3) };
+proc f(x, y) { if (x < y and not (x == y)) { return x; } else { return -y % 2; } }
+on update(dt) { while (1) { a[0] = p.x + f(1, 2) / 3; break; } }
+"""
+# how much of the script's own output ends up in the report
+OUTPUT_LIMIT = 2000
+
+class ScriptTimeout(BaseException):
+    # not an Exception, so the interpreter can't swallow it while wrapping builtin errors
+    pass
+
+def _on_alarm(signum, frame):
+    raise ScriptTimeout()
+
+def _init_worker(memory_limit_mb):
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+    parse_source(WARMUP_SCRIPT)
+
+def _canonical(value, seen):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if id(value) in seen:
+        return "<cycle>"
+
+    seen = seen | {id(value)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item, seen) for item in value]
+    if isinstance(value, range):
+        return ["range", value.start, value.stop, value.step]
+    if isinstance(value, Vec2):
+        return ["Vec2", _canonical(value.x, seen), _canonical(value.y, seen)]
+    if isinstance(value, Shape):
+        props = {name: _canonical(prop, seen) for name, prop in sorted(vars(value).items())
+                 if not name.startswith('_')}
+        return [type(value).__name__, props]
+    if isinstance(value, Map):
+        # insertion order doesn't matter for a map, entries are sorted by their canonical key
+        items = [[_canonical(key, seen), _canonical(item, seen)] for key, item in zip(value.keys(), value.values())]
+        items.sort(key=lambda pair: json.dumps(pair[0], sort_keys=True, default=repr))
+        return ["Map", items]
+    return [type(value).__name__]
+
+def state_digest(scope):
+    """Stable SHA-256 of the global variables of a finished script."""
+    canonical = {name: _canonical(value, frozenset()) for name, value in sorted(scope.items())}
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=repr).encode()).hexdigest()
+
+def run_script(path, ticks, fps, timeout):
+    """Runs a single script headless and describes the outcome as a JSON-serializable dict."""
+    result = {'path': path, 'status': 'ok', 'error': None, 'ticks': 0, 'digest': None}
+    output = io.StringIO()
+    visitor = None
+    start = time.perf_counter()
+
+    if timeout:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            tree = parse_file(path)
+            result['parse_time'] = time.perf_counter() - start
+            if tree is None:
+                raise SyntaxError("Parsing failed")
+
+            graphics_controller = HeadlessGraphicsController((800, 800))
+            visitor = CustomInterpreterVisitor(graphics_controller)
+            graphics_controller.add_visitor(visitor)
+            setup_builtin_functions(visitor, graphics_controller)
+
+            visitor.visit(tree)
+            for _ in range(ticks):
+                graphics_controller.tick(1 / fps)
+                result['ticks'] += 1
+    except ScriptTimeout:
+        result['status'] = 'timeout'
+        result['error'] = {'message': f"Script did not finish within {timeout}s"}
+    except FileNotFoundError:
+        result['status'] = 'not_found'
+        result['error'] = {'message': f"File not found: {path}"}
+    except SyntaxError as e:
+        result['status'] = 'syntax_error'
+        result['error'] = {'message': e.msg, 'line': e.lineno, 'column': e.offset}
+    except InterpreterRuntimeError as e:
+        result['status'] = 'runtime_error'
+        result['error'] = {'message': e.message, 'line': e.line, 'column': e.column}
+    except MemoryError:
+        result['status'] = 'memory_error'
+        result['error'] = {'message': "Memory limit exceeded"}
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = {'message': f"{type(e).__name__}: {e}"}
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        # procs still waiting or cut off by the timeout must not keep running in a reused worker
+        if visitor is not None:
+            visitor.scheduler.close()
+
+    result['time'] = time.perf_counter() - start
+    result['output'] = output.getvalue()[-OUTPUT_LIMIT:]
+    # the state of a script that was cut off is arbitrary, so there is nothing to compare
+    if visitor is not None and result['status'] in ('ok', 'runtime_error', 'error'):
+        result['digest'] = state_digest(visitor.scopes[0])
+    return result
+
+def collect_scripts(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(glob.glob(os.path.join(pattern, '**', '*.miasi'), recursive=True))
+        else:
+            paths.extend(glob.glob(pattern, recursive=True) or [pattern])
+    return sorted(set(paths))
+
+def run_batch(paths, ticks=60, fps=60, timeout=10.0, memory_limit_mb=None, workers=None):
+    start = time.perf_counter()
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(memory_limit_mb,)) as pool:
+        futures = {pool.submit(run_script, path, ticks, fps, timeout): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                results.append({'path': futures[future], 'status': 'crashed',
+                                'error': {'message': "Worker process died"}})
+            except Exception as e:
+                results.append({'path': futures[future], 'status': 'crashed',
+                                'error': {'message': f"{type(e).__name__}: {e}"}})
+
+    results.sort(key=lambda r: r['path'])
+    statuses = {}
+    for r in results:
+        statuses[r['status']] = statuses.get(r['status'], 0) + 1
+
+    return {
+        'summary': {
+            'total': len(results),
+            'ok': statuses.get('ok', 0),
+            'failed': len(results) - statuses.get('ok', 0),
+            'statuses': statuses,
+            'elapsed': time.perf_counter() - start,
+        },
+        'scripts': results,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many scripts headless in worker processes and report the results as JSON.")
+    parser.add_argument("scripts", nargs='+', help="script files, directories or glob patterns")
+    parser.add_argument("--ticks", type=int, default=60, help="update ticks to run after the top-level code")
+    parser.add_argument("--fps", type=float, default=60, help="ticks per simulated second (dt = 1 / fps)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per script, 0 disables the limit")
+    parser.add_argument("--memory-limit", type=int, default=None, help="address space limit of a worker in MB")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--report", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    paths = collect_scripts(args.scripts)
+    report = run_batch(paths, args.ticks, args.fps, args.timeout, args.memory_limit, args.workers)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    summary = report['summary']
+    print(f"{summary['ok']}/{summary['total']} scripts passed in {summary['elapsed']:.2f}s", file=sys.stderr)
+    return 0 if summary['failed'] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+class BindingCycleError(Exception):
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("Binding cycle: " + " -> ".join(binding.name for binding in cycle))
+
+class Binding:
+    """
+    A target kept equal to an expression. The target is a variable in a given scope or
+    a property of a given object; `deps` maps every key the expression read last time
+    to the scope or object it belongs to, which also keeps that object alive, so its id
+    can't be reused by another one.
+    """
+    __slots__ = ('name', 'owner', 'attribute', 'is_variable', 'key', 'expression', 'ctx', 'scopes', 'scope_ids', 'deps')
+
+    def __init__(self, name, owner, attribute, is_variable, expression, ctx, scopes):
+        self.name = name
+        self.owner = owner
+        self.attribute = attribute
+        self.is_variable = is_variable
+        self.key = (id(owner), attribute)
+        self.expression = expression
+        self.ctx = ctx
+        self.scopes = scopes
+        self.scope_ids = {id(scope) for scope in scopes}
+        self.deps = {}
+
+    def get(self):
+        if self.is_variable:
+            return self.owner[self.attribute]
+        return getattr(self.owner, self.attribute)
+
+    def set(self, value):
+        if self.is_variable:
+            self.owner[self.attribute] = value
+        else:
+            setattr(self.owner, self.attribute, value)
+
+def _unchanged(old, new):
+    # plain values compare by value, everything else (shapes, points, arrays) by identity
+    if old is new:
+        return True
+    return type(old) is type(new) and isinstance(new, (int, float, str, tuple)) and old == new
+
+class Bindings:
+    """
+    Reactive bindings of the interpreter.
+
+    Reads of variables and properties are reported with `read` and writes with `changed`,
+    both keyed by (id of the scope or object, name). While a binding's expression is evaluated,
+    its reads are recorded as its dependencies. A write to a dependency only marks the binding
+    dirty; `flush` recomputes dirty bindings once, in topological order, so a binding reading
+    the target of another one runs after it. Reading the target of a binding while some are
+    dirty flushes first, so bound values are never seen stale.
+
+    `evaluate(binding)` evaluates the expression of a binding in its own scopes.
+    """
+
+    def __init__(self, evaluate):
+        self.active = False
+        self.targets: dict[tuple, Binding] = {}
+        self.dependents: dict[tuple, dict[Binding, None]] = {}
+        self.dirty: dict[Binding, None] = {}
+        # scopes captured by bindings, the scope pool must not recycle them
+        self.pinned: dict[int, dict] = {}
+
+        self.tracking = None
+        self._tracking_scopes = None
+        self._flushing = False
+        self._evaluate = evaluate
+
+        self.ticks = 0
+        self.recomputes = 0
+        self.recomputes_in_ticks = 0
+        self.recomputes_last_tick = 0
+        self._tick_start = 0
+
+    def bind(self, binding):
+        """Adds a binding, replacing any previous one of the same target, and computes it right away."""
+        self.active = True
+        previous = self.targets.get(binding.key)
+        if previous is not None:
+            self._drop_deps(previous)
+            self.dirty.pop(previous, None)
+
+        self.targets[binding.key] = binding
+        for scope in binding.scopes:
+            self.pinned[id(scope)] = scope
+
+        self.dirty[binding] = None
+        try:
+            self.flush()
+        except Exception:
+            self._drop_deps(binding)
+            self.dirty.pop(binding, None)
+            if self.targets.get(binding.key) is binding:
+                del self.targets[binding.key]
+            raise
+
+    def read(self, key, owner, is_scope):
+        if self.dirty and not self._flushing and key in self.targets:
+            self.flush()
+        # locals of procs called by the expression live in temporary scopes, they are not dependencies
+        if self.tracking is not None and (not is_scope or id(owner) in self._tracking_scopes):
+            self.tracking[key] = owner
+
+    def changed(self, key):
+        dependents = self.dependents.get(key)
+        if dependents:
+            self.dirty.update(dependents)
+
+    def _drop_deps(self, binding):
+        for key in binding.deps:
+            dependents = self.dependents.get(key)
+            if dependents is not None:
+                dependents.pop(binding, None)
+                if not dependents:
+                    del self.dependents[key]
+        binding.deps = {}
+
+    def _order(self, roots):
+        """Dirty bindings and everything reading their targets, each after the ones it reads."""
+        order = []
+        state = {}
+        path = []
+
+        def visit(binding):
+            mark = state.get(binding)
+            if mark == 'done':
+                return
+            if mark == 'visiting':
+                raise BindingCycleError(path[path.index(binding):] + [binding])
+
+            state[binding] = 'visiting'
+            path.append(binding)
+            for dependent in list(self.dependents.get(binding.key, ())):
+                visit(dependent)
+            path.pop()
+            state[binding] = 'done'
+            order.append(binding)
+
+        for binding in roots:
+            visit(binding)
+        order.reverse()
+        return order
+
+    def flush(self):
+        if self._flushing:
+            return
+
+        self._flushing = True
+        try:
+            # recomputing may change which keys a binding depends on, so a round can leave new dirty ones
+            rounds = 0
+            while self.dirty:
+                rounds += 1
+                if rounds > len(self.targets) + 1:
+                    raise BindingCycleError(list(self.dirty))
+
+                for binding in self._order(list(self.dirty)):
+                    if binding in self.dirty:
+                        del self.dirty[binding]
+                        self._recompute(binding)
+        finally:
+            self._flushing = False
+
+    def _recompute(self, binding):
+        self.tracking = {}
+        self._tracking_scopes = binding.scope_ids
+        try:
+            value = self._evaluate(binding)
+        finally:
+            deps, self.tracking, self._tracking_scopes = self.tracking, None, None
+
+        self._drop_deps(binding)
+        binding.deps = deps
+        for key in deps:
+            self.dependents.setdefault(key, {})[binding] = None
+        if binding.key in deps:
+            raise BindingCycleError([binding, binding])
+
+        self.recomputes += 1
+        try:
+            old = binding.get()
+        except (KeyError, AttributeError):
+            old = None
+        if _unchanged(old, value):
+            return
+
+        binding.set(value)
+        self.changed(binding.key)
+
+    def begin_tick(self):
+        self._tick_start = self.recomputes
+
+    def end_tick(self):
+        self.ticks += 1
+        self.recomputes_last_tick = self.recomputes - self._tick_start
+        self.recomputes_in_ticks += self.recomputes_last_tick
+
+    def summary(self):
+        per_tick = self.recomputes_in_ticks / self.ticks if self.ticks else 0
+        return (f"Bindings: {len(self.targets)} bound, {self.recomputes} recomputations, "
+                f"{per_tick:.2f} per tick over {self.ticks} ticks")
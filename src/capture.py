@@ -0,0 +1,114 @@
+import argparse
+import os
+import sys
+import time
+
+# capturing never needs a visible window, let arcade create an offscreen context
+os.environ.setdefault("ARCADE_HEADLESS", "1")
+
+from interpreter import CustomInterpreterVisitor, InterpreterRuntimeError, parse_file, setup_builtin_functions
+from values import Vec2
+from graphics import GraphicsController, GameView
+from frame_encoder import FORMATS, FrameEncoder
+import arcade
+
+class OffscreenGraphicsController(GraphicsController):
+    """
+    Graphics controller rendering into an offscreen framebuffer.
+    Nothing runs on its own: every `render_frame` call advances the script by one fixed tick
+    and returns the pixels of the resulting frame.
+    """
+
+    def __init__(self, window_size=(800, 600)):
+        super().__init__(window_size)
+        self.framebuffer = None
+
+    def start_display(self):
+        if self.window is not None:
+            return
+
+        width, height = self.window_size
+        self.window = arcade.Window(width, height, "MIASI-lang capture", visible=False)
+        self.game_view = GameView(self, self.command_queue)
+        self.window.show_view(self.game_view)
+
+        ctx = self.window.ctx
+        self.framebuffer = ctx.framebuffer(color_attachments=[ctx.texture(self.window.get_framebuffer_size(), components=4)])
+
+    def render_frame(self, delta_time):
+        self.game_view.on_update(delta_time)
+
+        with self.framebuffer.activate():
+            self.framebuffer.clear(color=self.game_view.background_color)
+            self.game_view.draw_scene()
+        return self.framebuffer.read(components=4)
+
+    def frame_size(self):
+        return self.framebuffer.size
+
+    def get_mouse_pos(self):
+        # there is no pointer offscreen, pretend it rests in the middle of the window
+        return Vec2(self.window_size[0] / 2, self.window_size[1] / 2)
+
+    def wait_for_display_close(self):
+        pass
+
+    def kill_display(self):
+        if self.window is not None:
+            self.window.close()
+            self.window = None
+
+def capture_file(filename, out_dir, frames, fps=60, fmt='png', window_size=(800, 800), workers=None, max_pending=16):
+    tree = parse_file(filename)
+    if tree is None:
+        print("Parsing failed. Halting execution.")
+        return
+
+    graphics_controller = OffscreenGraphicsController(window_size)
+    visitor = CustomInterpreterVisitor(graphics_controller)
+    graphics_controller.add_visitor(visitor)
+    setup_builtin_functions(visitor, graphics_controller)
+
+    visitor.visit(tree)
+
+    delta_time = 1 / fps
+    start = time.perf_counter()
+    try:
+        with FrameEncoder(out_dir, graphics_controller.frame_size(), fmt, workers, max_pending) as encoder:
+            for index in range(frames):
+                encoder.submit(index, graphics_controller.render_frame(delta_time))
+    finally:
+        graphics_controller.kill_display()
+    elapsed = time.perf_counter() - start
+
+    print(f"Captured {encoder.frames_written} frames to '{out_dir}' in {elapsed:.2f}s "
+          f"({encoder.frames_written / elapsed:.1f} frames/s)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a script offscreen and save every frame as an image.")
+    parser.add_argument("filename")
+    parser.add_argument("out_dir")
+    parser.add_argument("--frames", type=int, default=300, help="number of update ticks to capture")
+    parser.add_argument("--fps", type=float, default=60, help="ticks per simulated second (dt = 1 / fps)")
+    parser.add_argument("--format", choices=FORMATS, default='png')
+    parser.add_argument("--size", type=int, nargs=2, default=(800, 800), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--workers", type=int, default=None, help="number of encoding processes")
+    parser.add_argument("--max-pending", type=int, default=16, help="frames kept in memory while waiting for encoding")
+    args = parser.parse_args(argv)
+
+    try:
+        capture_file(args.filename, args.out_dir, args.frames, args.fps, args.format, tuple(args.size),
+                     args.workers, args.max_pending)
+    except FileNotFoundError:
+        print(f"Error: File not found: {args.filename}", file=sys.stderr)
+        return 1
+    except (InterpreterRuntimeError, NameError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    except SyntaxError:
+        print(f"Halting due to Syntax Error.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
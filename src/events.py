@@ -0,0 +1,95 @@
+import collections
+import time
+
+from values import Vec2
+
+def _merge_motion(previous, current):
+    # keep the newest position, add up the movement of every merged event
+    delta = Vec2(previous[1].x + current[1].x, previous[1].y + current[1].y)
+    return [current[0], delta, *current[2:]]
+
+# high-frequency events merged into a single one per tick
+COALESCED = {
+    'mousemove': _merge_motion,
+    'drag': _merge_motion,
+}
+
+def report_event_error(event_name, error):
+    print(f"Error scheduling {event_name} handler: {error}")
+
+class EventStats:
+    __slots__ = ('posted', 'coalesced', 'dispatched', 'latency_total', 'latency_max')
+
+    def __init__(self):
+        self.posted = 0
+        self.coalesced = 0
+        self.dispatched = 0
+        self.latency_total = 0
+        self.latency_max = 0
+
+class EventQueue:
+    """
+    Input events waiting for the next tick.
+
+    Window callbacks only `post` events; the interpreter takes them all with `drain` once per
+    tick, before the update event, so handlers never run in the middle of an update.
+    Events listed in `COALESCED` are merged: while one of them is the last waiting event, a new
+    event of the same name replaces its arguments in place instead of queueing another handler
+    call. Once another event was posted after it, the next one is queued separately.
+
+    Latency of an event is the time from posting it (the oldest post, for merged events)
+    to the start of its dispatch.
+    """
+
+    def __init__(self):
+        # [name, args, posted_ns]
+        self._pending = collections.deque()
+        self._waiting: dict[str, list] = {}
+        self.stats: dict[str, EventStats] = collections.defaultdict(EventStats)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def post(self, name, args, posted_ns=None):
+        stats = self.stats[name]
+        stats.posted += 1
+
+        merge = COALESCED.get(name)
+        if merge is not None:
+            waiting = self._waiting.get(name)
+            # merging into an event queued before others would dispatch the newer input first
+            if waiting is not None and self._pending and self._pending[-1] is waiting:
+                waiting[1] = merge(waiting[1], args)
+                stats.coalesced += 1
+                return
+
+        event = [name, args, time.monotonic_ns() if posted_ns is None else posted_ns]
+        if merge is not None:
+            self._waiting[name] = event
+        self._pending.append(event)
+
+    def drain(self):
+        """Yields (name, args) of every waiting event in posting order, events posted meanwhile included."""
+        while self._pending:
+            event = self._pending.popleft()
+            name, args, posted_ns = event
+            if self._waiting.get(name) is event:
+                del self._waiting[name]
+
+            self.record(name, posted_ns)
+            yield name, args
+
+    def record(self, name, posted_ns):
+        stats = self.stats[name]
+        latency = time.monotonic_ns() - posted_ns
+        stats.dispatched += 1
+        stats.latency_total += latency
+        stats.latency_max = max(stats.latency_max, latency)
+
+    def summary(self):
+        lines = ["Events:"]
+        for name, stats in sorted(self.stats.items()):
+            mean = stats.latency_total / stats.dispatched / 1e6 if stats.dispatched else 0
+            lines.append(f"  {name}: {stats.posted} posted, {stats.coalesced} coalesced, {stats.dispatched} dispatched, "
+                         f"latency mean {mean:.2f} ms, max {stats.latency_max / 1e6:.2f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,71 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+FORMATS = ('png', 'raw')
+
+def encode_frame(path, size, pixels, fmt):
+    """
+    Writes a single RGBA frame. `pixels` are rows read from OpenGL, bottom row first.
+    Raw frames are written as they are, PNG frames are flipped to the usual top-down order.
+    """
+    if fmt == 'raw':
+        with open(path, 'wb') as f:
+            f.write(pixels)
+        return path
+
+    from PIL import Image
+
+    image = Image.frombytes('RGBA', size, pixels).transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+    image.save(path, 'PNG')
+    return path
+
+class FrameEncoder:
+    """
+    Encodes captured frames in a pool of worker processes.
+
+    At most `max_pending` frames are held in memory at once: `submit` blocks
+    until a worker finishes one of them, so the simulation never runs further
+    ahead of the encoders than that.
+    """
+
+    def __init__(self, out_dir, size, fmt='png', workers=None, max_pending=16):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported frame format '{fmt}', expected one of: {', '.join(FORMATS)}")
+
+        self.out_dir = out_dir
+        self.size = size
+        self.fmt = fmt
+        self.frames_written = 0
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._futures = []
+        # spawn, so the workers don't inherit the OpenGL context of the capturing process
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+        os.makedirs(out_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close(cancel=exc_type is not None)
+
+    def submit(self, index, pixels):
+        self._pending.acquire()
+        path = os.path.join(self.out_dir, f"frame_{index:05d}.{self.fmt}")
+        try:
+            future = self._pool.submit(encode_frame, path, self.size, pixels, self.fmt)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _: self._pending.release())
+        self._futures.append(future)
+
+    def close(self, cancel=False):
+        self._pool.shutdown(wait=True, cancel_futures=cancel)
+        for future in self._futures:
+            if not future.cancelled():
+                future.result()
+                self.frames_written += 1
+        self._futures.clear()
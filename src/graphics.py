@@ -1,16 +1,101 @@
 import threading
 import queue
 
-from interpreter import Vec2
+from values import Vec2
+from scene import Scene
+from events import report_event_error
 from shape import *
 
+import arcade
+from arcade.gl import geometry
+from pyglet.window.key import symbol_string
+
+load_arcade()
+
+# shapes left unchanged for this many frames are rendered into the static layer cache
+STATIC_AFTER_FRAMES = 30
+CACHE_SAMPLES = 4
+
+def key_name(key):
+    # scripts compare keys by name: "a", "space", "left", "1"
+    return symbol_string(key).lower().lstrip('_')
+
+class StaticLayerCache:
+    """
+    Offscreen framebuffers holding the static part of each scene layer.
+    A layer is rendered into its framebuffer only when its static part changed,
+    every other frame the framebuffer is blitted as a single textured quad.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.ctx = window.ctx
+        self._framebuffers = {}
+        self._size = None
+        self._quad = geometry.quad_2d_fs()
+
+    def _framebuffers_for(self, layer):
+        # shapes are rendered into a multisampled framebuffer, like the window itself,
+        # and resolved into a plain one that can be sampled when blitting
+        pair = self._framebuffers.get(layer)
+        if pair is None:
+            multisampled = self.ctx.framebuffer(
+                color_attachments=[self.ctx.texture(self._size, components=4, samples=CACHE_SAMPLES)])
+            resolved = self.ctx.framebuffer(color_attachments=[self.ctx.texture(self._size, components=4)])
+            pair = self._framebuffers[layer] = (multisampled, resolved)
+        return pair
+
+    def update(self, scene, dirty_layers):
+        size = self.window.get_framebuffer_size()
+        if size != self._size:
+            # the cached textures match the window, everything has to be rendered again
+            self._size = size
+            self._framebuffers.clear()
+            dirty_layers = [number for number in scene.layer_order if scene.layers[number].static]
+
+        for number in dirty_layers:
+            layer = scene.layers[number]
+            layer.static_dirty = False
+            if not layer.static:
+                self._framebuffers.pop(number, None)
+                continue
+
+            fbo, resolved = self._framebuffers_for(number)
+            with fbo.activate():
+                fbo.clear(color=(0, 0, 0, 0))
+                # store premultiplied colours, so the blit below keeps translucent shapes intact
+                with self.ctx.enabled(self.ctx.BLEND):
+                    self.ctx.blend_func = (self.ctx.SRC_ALPHA, self.ctx.ONE_MINUS_SRC_ALPHA,
+                                           self.ctx.ONE, self.ctx.ONE_MINUS_SRC_ALPHA)
+                    for _, entry in sorted(layer.static.items()):
+                        point, shape = entry.point, entry.shape
+                        if shape.is_visible:
+                            shape.draw(point.x, point.y)
+                    self.ctx.blend_func = self.ctx.BLEND_DEFAULT
+            self.ctx.copy_framebuffer(fbo, resolved)
+            # the blit leaves its own framebuffers bound behind arcade's back
+            self.ctx.active_framebuffer.use(force=True)
+
+    def draw(self, layer):
+        pair = self._framebuffers.get(layer)
+        if pair is None:
+            return
+
+        pair[1].color_attachments[0].use(0)
+        with self.ctx.enabled(self.ctx.BLEND):
+            self.ctx.blend_func = (self.ctx.ONE, self.ctx.ONE_MINUS_SRC_ALPHA)
+            self._quad.render(self.ctx.utility_textured_quad_program)
+            self.ctx.blend_func = self.ctx.BLEND_DEFAULT
+
 class GameView(arcade.View):
-    def __init__(self, controller, command_queue):
+    def __init__(self, controller, command_queue, static_after=STATIC_AFTER_FRAMES):
         super().__init__()
         self.controller = controller
         self.background_color = (255, 255, 255)
-        self.shapes: list[(float, float, Shape)] = []
+        self.scene = Scene()
         self.command_queue = command_queue
+        self.static_after = static_after
+        self.static_cache = None
 
     def process_commands(self):
         while True:
@@ -30,8 +115,14 @@ class GameView(arcade.View):
                     color, = args
                     self.background_color = color
                 elif cmd_type == "draw":
-                    point, shape, = args
-                    self.shapes.append((point, shape))
+                    point, shape, layer = args
+                    self.scene.add(point, shape, layer)
+                elif cmd_type == "remove":
+                    shape, = args
+                    self.scene.remove(shape)
+                elif cmd_type == "clear_layer":
+                    layer, = args
+                    self.scene.clear_layer(layer)
 
                 self.command_queue.task_done()
             except queue.Empty:
@@ -43,26 +134,41 @@ class GameView(arcade.View):
         self.process_commands()
 
         if self.controller and self.controller.interpreter_visitor:
-            try:
-                self.controller.interpreter_visitor.execute_event('update', [delta_time])
-            except Exception as e:
-                print(f"Error scheduling update handler: {e}")
+            self.controller.interpreter_visitor.process_events(delta_time, report_event_error)
 
-    def on_mouse_release(self, x: int, y: int, button: int, modifiers: int) -> bool | None:
+    def post_event(self, event_name, event_args):
         if self.controller and self.controller.interpreter_visitor:
-            try:
-                self.controller.interpreter_visitor.execute_event('click', [Vec2(x, y), button, modifiers])
-            except Exception as e:
-                print(f"Error scheduling click handler: {e}")
+            self.controller.interpreter_visitor.post_event(event_name, event_args)
+
+    def on_mouse_release(self, x: int, y: int, button: int, modifiers: int) -> bool | None:
+        self.post_event('click', [Vec2(x, y), button, modifiers])
+
+    def on_mouse_motion(self, x: int, y: int, dx: int, dy: int):
+        self.post_event('mousemove', [Vec2(x, y), Vec2(dx, dy)])
+
+    def on_mouse_drag(self, x: int, y: int, dx: int, dy: int, buttons: int, modifiers: int):
+        self.post_event('drag', [Vec2(x, y), Vec2(dx, dy), buttons, modifiers])
+
+    def on_key_release(self, key, modifiers):
+        self.post_event('keyup', [key_name(key), modifiers])
 
     def on_draw(self):
         self.clear(self.background_color)
+        self.draw_scene()
 
-        for point, shape in self.shapes:
-            if shape.is_visible:
+    def draw_scene(self):
+        if self.static_cache is None:
+            self.static_cache = StaticLayerCache(self.window)
+        self.static_cache.update(self.scene, self.scene.refresh_static(self.static_after))
+
+        viewport = (0, 0, self.window.width, self.window.height)
+        for number in self.scene.layer_order:
+            self.static_cache.draw(number)
+            for point, shape in self.scene.visible_in(self.scene.layers[number].dynamic, *viewport):
                 shape.draw(point.x, point.y)
 
     def on_key_press(self, key, modifiers):
+        self.post_event('keydown', [key_name(key), modifiers])
         if key == arcade.key.ESCAPE:
             print("ESC pressed, closing the window...")
             self.controller.kill_display()
@@ -100,8 +206,14 @@ class GraphicsController:
             self.game_view = None
             self._stop_event.set()
 
-    def draw_shape(self, point, shape: Shape):
-        self.command_queue.put(("draw", point, shape))
+    def draw_shape(self, point, shape: Shape, layer=0):
+        self.command_queue.put(("draw", point, shape, layer))
+
+    def remove_shape(self, shape: Shape):
+        self.command_queue.put(("remove", shape))
+
+    def clear_layer(self, layer):
+        self.command_queue.put(("clear_layer", layer))
 
     def wait_for_display_close(self):
         if self._arcade_thread:
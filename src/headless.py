@@ -0,0 +1,59 @@
+from values import Vec2
+from scene import Scene
+
+class HeadlessGraphicsController:
+    """
+    Graphics controller without any window. It offers the same API as `GraphicsController`,
+    but applies drawing commands straight to its scene, and the script only advances when
+    `tick` is called.
+    """
+
+    def __init__(self, window_size=(800, 600)):
+        self.window_size = tuple(window_size)
+        self.background_color = (255, 255, 255)
+        self.scene = Scene()
+
+        self.interpreter_visitor = None
+
+    def add_visitor(self, visitor):
+        self.interpreter_visitor = visitor
+
+    def start_display(self):
+        pass
+
+    def wait_for_display_close(self):
+        pass
+
+    def kill_display(self):
+        pass
+
+    def tick(self, delta_time):
+        self.interpreter_visitor.process_events(delta_time)
+
+    def draw_shape(self, point, shape, layer=0):
+        self.scene.add(point, shape, layer)
+
+    def remove_shape(self, shape):
+        self.scene.remove(shape)
+
+    def clear_layer(self, layer):
+        self.scene.clear_layer(layer)
+
+    def set_window_width(self, width):
+        self.window_size = (width, self.window_size[1])
+
+    def set_window_height(self, height):
+        self.window_size = (self.window_size[0], height)
+
+    def get_window_width(self):
+        return self.window_size[0]
+
+    def get_window_height(self):
+        return self.window_size[1]
+
+    def get_mouse_pos(self):
+        # there is no pointer without a window, pretend it rests in the middle of it
+        return Vec2(self.window_size[0] / 2, self.window_size[1] / 2)
+
+    def set_background_color(self, color):
+        self.background_color = color
@@ -1,44 +1,45 @@
 import sys
 import codecs
 import traceback
-import random
 import math
+from typing import TYPE_CHECKING
 
-class Vec2:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def length(self):
-        return math.sqrt(self.x**2 + self.y**2)
-
-    def __str__(self):
-        return f"({self.x}, {self.y})"
-
-    def normalized(self):
-        length = self.length()
-        if length == 0:
-            return Vec2(0, 0)
-        return Vec2(self.x / length, self.y / length)
-
+from values import Vec2, Map
 
 def is_num(value):
     return isinstance(value, (int, float))
 
-from antlr4 import CommonTokenStream, FileStream
+from antlr4 import CommonTokenStream, FileStream, InputStream
 from antlr4.error.ErrorListener import ErrorListener
 
 from gen.GrammarLexer import GrammarLexer
 from gen.GrammarParser import GrammarParser
 from gen.GrammarVisitor import GrammarVisitor
 
-from graphics import GraphicsController
+# the window backend (graphics -> arcade) is only imported once a window is actually started
+if TYPE_CHECKING:
+    from graphics import GraphicsController
 from shape import *
+from alloc import AllocationTracker
+import arraylib
+import noise
+from scheduler import Scheduler
+from events import EventQueue
+from bindings import Binding, BindingCycleError, Bindings
+
+# upper bound of interned rgb colours, animated colours would grow the table forever otherwise
+COLOR_INTERN_LIMIT = 4096
 
 class ReturnValue(Exception):
     def __init__(self, value=None): self.value = value
 class BreakLoop(Exception): pass
 class ContinueLoop(Exception): pass
+
+# control flow signals are raised very often, so every statement reuses the same instances.
+# The traceback is dropped on each raise, otherwise every raise would extend it
+RETURN_SIGNAL = ReturnValue()
+BREAK_SIGNAL = BreakLoop()
+CONTINUE_SIGNAL = ContinueLoop()
 class InterpreterRuntimeError(Exception):
     def __init__(self, message, ctx): # Store context
         super().__init__(message)
@@ -55,7 +56,9 @@ class InterpreterRuntimeError(Exception):
 class BasicErrorListener(ErrorListener):
     def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
         print(f"Error:{line}:{column} - Syntax Error: {msg}", file=sys.stderr)
-        raise SyntaxError(f"Line {line}:{column} {msg}")
+        error = SyntaxError(f"Line {line}:{column} {msg}")
+        error.lineno, error.offset = line, column
+        raise error
 
 def builtin_print(*args):
     print(*args)
@@ -76,15 +79,33 @@ def parse_hex_color(hex_str: str):
 
 
 class CustomInterpreterVisitor(GrammarVisitor):
-    def __init__(self, graphics_controller: GraphicsController):
+    def __init__(self, graphics_controller: 'GraphicsController', low_alloc=False, alloc_stats=False):
         self.functions: dict[str, {}] = {}
         self.builtin_functions = {}
         self.scopes = [{}]
         self.properties = {}
-        self.handled_events: dict[str, {}] = {}
+        self.handled_events: dict[str, list] = {}
+        self.events = EventQueue()
 
         self.graphics_controller = graphics_controller
 
+        # allocation-aware mode: pooled scopes, interned colours and frame-aligned GC;
+        # allocations are counted in it, and in the regular mode with `alloc_stats`
+        self.low_alloc = low_alloc
+        self.allocation_tracker = None
+        self.allocation_counts = None
+        if low_alloc or alloc_stats:
+            self.allocation_tracker = AllocationTracker(frame_gc=low_alloc, trace_memory=alloc_stats)
+            self.allocation_counts = self.allocation_tracker.counts
+        self._free_scopes = []
+        self._colors = {}
+
+        # timers and suspended procs, advanced by the dt of every update event
+        self.scheduler = Scheduler(self.switch_scopes)
+
+        # `bind` statements, recomputed when a variable or property they read changes
+        self.bindings = Bindings(self.evaluate_binding)
+
     def add_builtin_function(self, name, func):
         if name in self.functions or name in self.builtin_functions:
             raise NameError(f"Cannot add built-in function: Name '{name}' is already defined.")
@@ -104,12 +125,41 @@ class CustomInterpreterVisitor(GrammarVisitor):
         self.properties[name] = func
 
     def enter_scope(self):
+        if self._free_scopes:
+            self.scopes.append(self._free_scopes.pop())
+            return
         self.scopes.append({})
+        if self.allocation_counts is not None:
+            self.allocation_counts['scopes'] += 1
 
     def exit_scope(self):
         # we don't want to pop the global scope
         if len(self.scopes) > 1:
-            self.scopes.pop()
+            scope = self.scopes.pop()
+            if self.low_alloc and id(scope) not in self.bindings.pinned:
+                scope.clear()
+                self._free_scopes.append(scope)
+
+    def switch_scopes(self, scopes):
+        previous, self.scopes = self.scopes, scopes
+        return previous
+
+    def proc_callback(self, proc, args=()):
+        if proc not in self.functions and proc not in self.builtin_functions:
+            raise ValueError(f"'{proc}' is not a function")
+        return lambda: self.call_function(proc, list(args), None)
+
+    def spawn(self, proc, *args):
+        # a task starts with only the global scope, like a regular call
+        return self.scheduler.spawn(self.proc_callback(proc, args), [self.scopes[0]])
+
+    def intern_color(self, color):
+        interned = self._colors.get(color)
+        if interned is None:
+            if len(self._colors) >= COLOR_INTERN_LIMIT:
+                self._colors.clear()
+            interned = self._colors[color] = color
+        return interned
 
     def declare_variable(self, name, value):
         if name in self.builtin_functions:
@@ -120,6 +170,8 @@ class CustomInterpreterVisitor(GrammarVisitor):
             print(f"Warning: Variable '{name}' already declared in this scope (shadowing).")
 
         self.scopes[-1][name] = value
+        if self.bindings.active:
+            self.bindings.changed((id(self.scopes[-1]), name))
 
     def print_scopes(self):
         for i, scope in enumerate(self.scopes):
@@ -132,6 +184,8 @@ class CustomInterpreterVisitor(GrammarVisitor):
         for scope in reversed(self.scopes):
             if name in scope:
                 scope[name] = value
+                if self.bindings.active:
+                    self.bindings.changed((id(scope), name))
                 return
         raise NameError(f"Variable '{name}' is not defined before assignment")
 
@@ -141,6 +195,34 @@ class CustomInterpreterVisitor(GrammarVisitor):
                 return scope[name]
         return None
 
+    def read_variable(self, name):
+        """Same as `get_variable`, but reports the read to the bindings."""
+        for scope in reversed(self.scopes):
+            if name in scope:
+                self.read_bound((id(scope), name), scope, True)
+                return scope[name]
+        return None
+
+    def read_bound(self, key, owner, is_scope):
+        try:
+            self.bindings.read(key, owner, is_scope)
+        except BindingCycleError as e:
+            raise InterpreterRuntimeError(str(e), e.cycle[0].ctx) from e
+
+    def flush_bindings(self):
+        try:
+            self.bindings.flush()
+        except BindingCycleError as e:
+            raise InterpreterRuntimeError(str(e), e.cycle[0].ctx) from e
+
+    def evaluate_binding(self, binding):
+        # a fresh list, so scopes entered while evaluating don't end up in the binding
+        previous = self.switch_scopes(list(binding.scopes))
+        try:
+            return self.visit(binding.expression)
+        finally:
+            self.switch_scopes(previous)
+
     def visitProgram(self, ctx:GrammarParser.ProgramContext):
         self.graphics_controller.start_display()
         self.graphics_controller.set_background_color((125, 125, 255))
@@ -154,6 +236,12 @@ class CustomInterpreterVisitor(GrammarVisitor):
         except ContinueLoop:
             print(f"Error: 'continue' encountered outside of a loop at top level.")
 
+        if self.bindings.active:
+            self.flush_bindings()
+
+        if self.allocation_tracker:
+            self.allocation_tracker.freeze()
+
         return None
 
     def visitSetStatement(self, ctx:GrammarParser.SetStatementContext):
@@ -171,14 +259,40 @@ class CustomInterpreterVisitor(GrammarVisitor):
 
         return None
 
+    def visitBindStatement(self, ctx: GrammarParser.BindStatementContext):
+        target_ctx = ctx.assignmentTarget()
+        lhs = self.visit(target_ctx)
+
+        if isinstance(lhs, str):
+            for scope in reversed(self.scopes):
+                if lhs in scope:
+                    break
+            else:
+                raise InterpreterRuntimeError(f"Variable '{lhs}' is not defined before binding", target_ctx)
+            owner, attribute, is_variable = scope, lhs, True
+        elif isinstance(lhs[0], (list, Map)):
+            raise InterpreterRuntimeError("Only variables and properties can be bound, not elements", target_ctx)
+        else:
+            owner, attribute, is_variable = lhs[0], lhs[1], False
+
+        binding = Binding(target_ctx.getText(), owner, attribute, is_variable, ctx.expression(), ctx, list(self.scopes))
+        try:
+            self.bindings.bind(binding)
+        except BindingCycleError as e:
+            raise InterpreterRuntimeError(str(e), ctx) from e
+
+        return None
+
     def visitFunctionDefinition(self, ctx: GrammarParser.FunctionDefinitionContext):
         name = ctx.IDENTIFIER().getText()
         if name in self.builtin_functions:
             raise NameError(f"Function '{name}' is a reserved built-in function name.")
         if name in self.functions:
             raise NameError(f"Function '{name}' has already been defined.")
+        params = ctx.parameterList()
         self.functions[name] = {
-            'params': ctx.parameterList(),
+            'params': params,
+            'param_names': [p.getText() for p in params.IDENTIFIER()] if params else [],
             'body': ctx.blockStatement()
         }
         return None
@@ -203,9 +317,17 @@ class CustomInterpreterVisitor(GrammarVisitor):
             if isinstance(obj, list):
                 index = lhs[1]
                 obj[index] = rhs
+            elif isinstance(obj, Map):
+                key = lhs[1]
+                try:
+                    obj[key] = rhs
+                except TypeError as e:
+                    raise InterpreterRuntimeError(f"Type Error: Map key of type {type(key).__name__} is not hashable", ctx.assignmentTarget()) from e
             elif isinstance(obj, object):
                 prop = lhs[1]
                 setattr(obj, prop, rhs)
+                if self.bindings.active:
+                    self.bindings.changed((id(obj), prop))
             else:
                 raise InterpreterRuntimeError(f"Unsupported assignment target type: {type(obj).__name__}", ctx.expression())
 
@@ -229,13 +351,14 @@ class CustomInterpreterVisitor(GrammarVisitor):
         value = None
         if ctx.expression():
             value = self.visit(ctx.expression())
-        raise ReturnValue(value)
+        RETURN_SIGNAL.value = value
+        raise RETURN_SIGNAL.with_traceback(None)
 
     def visitBreakStatement(self, ctx: GrammarParser.BreakStatementContext):
-        raise BreakLoop()
+        raise BREAK_SIGNAL.with_traceback(None)
 
     def visitContinueStatement(self, ctx: GrammarParser.ContinueStatementContext):
-        raise ContinueLoop()
+        raise CONTINUE_SIGNAL.with_traceback(None)
 
     def visitIfStatement(self, ctx: GrammarParser.IfStatementContext):
         condition = self.visit(ctx.expression())
@@ -266,14 +389,16 @@ class CustomInterpreterVisitor(GrammarVisitor):
                 break
             except ContinueLoop:
                 continue
-
-            self.exit_scope()
+            finally:
+                self.exit_scope()
 
     def visitListComprehension(self, ctx:GrammarParser.ListComprehensionContext):
         name = ctx.IDENTIFIER().getText()
         iterable = self.visit(ctx.iterExpr)
 
         output_arr = []
+        if self.allocation_counts is not None:
+            self.allocation_counts['arrays'] += 1
 
         for item in iterable:
             self.enter_scope()
@@ -413,7 +538,10 @@ class CustomInterpreterVisitor(GrammarVisitor):
             return self.visit(ctx.listComprehension())
         if ctx.IDENTIFIER():
             # first check if it's a variable
-            name = self.get_variable(ctx.IDENTIFIER().getText())
+            if self.bindings.active:
+                name = self.read_variable(ctx.IDENTIFIER().getText())
+            else:
+                name = self.get_variable(ctx.IDENTIFIER().getText())
             if name is not None:
                 return name
 
@@ -434,6 +562,8 @@ class CustomInterpreterVisitor(GrammarVisitor):
             return self.visit(ctx.shapeLiteral())
         if ctx.arrayLiteral():
             return self.visit(ctx.arrayLiteral())
+        if ctx.mapLiteral():
+            return self.visit(ctx.mapLiteral())
 
         raise InterpreterRuntimeError("Unsupported atom", ctx)
 
@@ -453,6 +583,9 @@ class CustomInterpreterVisitor(GrammarVisitor):
         obj = self.visit(ctx.postfixExpr())
         prop_name = ctx.IDENTIFIER().getText()
 
+        if self.bindings.active:
+            self.read_bound((id(obj), prop_name), obj, False)
+
         try:
             prop = getattr(obj, prop_name)
             return prop
@@ -466,6 +599,14 @@ class CustomInterpreterVisitor(GrammarVisitor):
         arr = self.visit(arr_ctx)
         index = self.visit(index_ctx)
 
+        if isinstance(arr, Map):
+            try:
+                return arr[index]
+            except KeyError:
+                raise InterpreterRuntimeError(f"Key Error: Map has no key {index}", index_ctx)
+            except TypeError:
+                raise InterpreterRuntimeError(f"Type Error: Map key of type {type(index).__name__} is not hashable",
+                                              index_ctx)
         if not isinstance(arr, list):
             raise InterpreterRuntimeError(f"Type Error: Cannot index non-array type {type(arr).__name__}",
                                           index_ctx)
@@ -481,16 +622,26 @@ class CustomInterpreterVisitor(GrammarVisitor):
     def function_call(self, ctx: GrammarParser.PostfixExprContext):
         function_name = self.visit(ctx.postfixExpr())
 
-        if (function_name not in self.functions) and (function_name not in self.builtin_functions):
-            raise InterpreterRuntimeError(f"Function '{function_name}' is not defined.", ctx)
-
         call_args = []
         if ctx.argumentList() is not None:
             call_args = self.visit(ctx.argumentList())
 
+        return self.call_function(function_name, call_args, ctx)
+
+    def call_function(self, function_name, call_args, ctx):
+        """Calls a built-in or user-defined function by name, also used by builtins taking procs."""
+        if (function_name not in self.functions) and (function_name not in self.builtin_functions):
+            raise InterpreterRuntimeError(f"Function '{function_name}' is not defined.", ctx)
+
         if function_name in self.builtin_functions:
             try:
                 return self.builtin_functions[function_name](*call_args)
+            except InterpreterRuntimeError as e:
+                # raised by a proc the builtin called; it already points at the right place,
+                # unless the proc itself couldn't be called
+                if e.line == '?':
+                    raise InterpreterRuntimeError(f"Error calling builtin function '{function_name}': {e.message}", ctx) from e
+                raise
             except Exception as e:
                 raise InterpreterRuntimeError(f"Error calling builtin function '{function_name}': {e}", ctx) from e
 
@@ -498,11 +649,8 @@ class CustomInterpreterVisitor(GrammarVisitor):
         params = func_data['params']
         body = func_data['body']
 
-        param_names = []
-        arity = 0
-        if params:
-            param_names = [p.getText() for p in params.IDENTIFIER()]
-            arity = len(param_names)
+        param_names = func_data['param_names']
+        arity = len(param_names)
 
         if arity != len(call_args):
             raise InterpreterRuntimeError(f"Incorrect number of arguments for function '{function_name}'. Expected {arity}, got {len(call_args)}", ctx)
@@ -520,6 +668,7 @@ class CustomInterpreterVisitor(GrammarVisitor):
 
         except ReturnValue as rv:
             return_value = rv.value
+            rv.value = None
         finally:
             self.exit_scope()
 
@@ -529,6 +678,20 @@ class CustomInterpreterVisitor(GrammarVisitor):
         return [self.visit(expr) for expr in ctx.expression()]
 
     def visitLiteral(self, ctx: GrammarParser.LiteralContext):
+        # number, boolean and string literals are immutable, so each node is evaluated once
+        cached = getattr(ctx, 'cached_value', ctx)
+        if cached is not ctx:
+            return cached
+
+        if ctx.pointLiteral():
+            return self.visit(ctx.pointLiteral())
+        if ctx.colorLiteral():
+            return self.visitColorLiteral(ctx.colorLiteral())
+
+        ctx.cached_value = self.evaluate_constant_literal(ctx)
+        return ctx.cached_value
+
+    def evaluate_constant_literal(self, ctx: GrammarParser.LiteralContext):
         if ctx.NUMBER():
             num_str = ctx.NUMBER().getText()
             if '.' in num_str:
@@ -538,34 +701,38 @@ class CustomInterpreterVisitor(GrammarVisitor):
         elif ctx.BOOLEAN():
             bool_str = ctx.BOOLEAN().getText()
             return True if bool_str == 'true' else False
-        elif ctx.colorLiteral():
-            return self.visitColorLiteral(ctx.colorLiteral())
         elif ctx.STRING():
             string_literal = ctx.STRING().getText()
             value_inside_quotes = string_literal[1:-1]
             processed_value, _ = codecs.unicode_escape_decode(value_inside_quotes)
             return processed_value
-        elif ctx.pointLiteral():
-            return self.visit(ctx.pointLiteral())
         else:
             raise TypeError("Unsupported literal type")
 
     def visitPointLiteral(self, ctx:GrammarParser.PointLiteralContext):
         x = self.visit(ctx.x)
         y = self.visit(ctx.y)
+        if self.allocation_counts is not None:
+            self.allocation_counts['points'] += 1
         return Vec2(x, y)
 
     def visitColorLiteral(self, ctx: GrammarParser.ColorLiteralContext):
         if ctx.HEX_COLOR():
-            hex_str = ctx.HEX_COLOR().getText()[1:]
-            if len(hex_str) != 6:
-                raise ValueError(f"Invalid hex color string: '{hex_str}'")
-            color = parse_hex_color(hex_str)
+            color = getattr(ctx, 'cached_value', None)
+            if color is None:
+                hex_str = ctx.HEX_COLOR().getText()[1:]
+                if len(hex_str) != 6:
+                    raise ValueError(f"Invalid hex color string: '{hex_str}'")
+                color = ctx.cached_value = parse_hex_color(hex_str)
             return color
         elif ctx.rgbColor():
             r = self.visit(ctx.rgbColor().r)
             g = self.visit(ctx.rgbColor().g)
             b = self.visit(ctx.rgbColor().b)
+            if self.allocation_counts is not None:
+                self.allocation_counts['colors'] += 1
+            if self.low_alloc:
+                return self.intern_color((r, g, b))
             return r, g, b
         else:
             raise TypeError("Unsupported color literal type")
@@ -636,32 +803,102 @@ class CustomInterpreterVisitor(GrammarVisitor):
         arr = []
         if ctx.argumentList():
             arr = self.visit(ctx.argumentList())
+        if self.allocation_counts is not None:
+            self.allocation_counts['arrays'] += 1
 
         return arr
 
+    def visitMapLiteral(self, ctx: GrammarParser.MapLiteralContext):
+        result = Map()
+        if self.allocation_counts is not None:
+            self.allocation_counts['maps'] += 1
+        if ctx.mapEntryList():
+            for entry_ctx in ctx.mapEntryList().mapEntry():
+                key, value = self.visit(entry_ctx)
+                try:
+                    result[key] = value
+                except TypeError as e:
+                    raise InterpreterRuntimeError(f"Type Error: Map key of type {type(key).__name__} is not hashable", entry_ctx.key) from e
+
+        return result
+
+    def visitMapEntry(self, ctx: GrammarParser.MapEntryContext):
+        return self.visit(ctx.key), self.visit(ctx.value)
+
     def visitEventHandler(self, ctx:GrammarParser.EventHandlerContext):
         event_name = ctx.IDENTIFIER().getText()
 
+        params = ctx.parameterList()
         event = {
-            'params': ctx.parameterList(),
+            'params': params,
+            'param_names': [p.getText() for p in params.IDENTIFIER()] if params else [],
             'body': ctx.blockStatement(),
             'ctx': ctx
         }
 
-        self.handled_events[event_name] = event
+        # every handler of an event runs, in the order they were defined
+        self.handled_events.setdefault(event_name, []).append(event)
 
         return None
 
-    def execute_event(self, event_name, event_args):
-        if event_name not in self.handled_events:
-            return
+    def post_event(self, event_name, event_args):
+        self.events.post(event_name, event_args)
+
+    def process_events(self, delta_time, on_error=None):
+        """
+        Dispatches every queued input event and then the update event, as one batch per tick.
+        Errors of handlers are passed to `on_error(event_name, error)` if given, otherwise raised.
+        """
+        self.bindings.begin_tick()
+        self.events.post('update', [delta_time])
+        for event_name, event_args in self.events.drain():
+            try:
+                self.execute_event(event_name, event_args, on_error)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(event_name, e)
 
-        event = self.handled_events[event_name]
+        if self.bindings.active:
+            try:
+                self.flush_bindings()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error('bind', e)
+        self.bindings.end_tick()
+
+    def execute_event(self, event_name, event_args, on_error=None):
+        tracker = self.allocation_tracker
+        if tracker is None or event_name != 'update':
+            return self.dispatch_event(event_name, event_args, on_error)
+
+        tracker.begin_tick()
+        try:
+            return self.dispatch_event(event_name, event_args, on_error)
+        finally:
+            tracker.end_tick()
+
+    def dispatch_event(self, event_name, event_args, on_error=None):
+        # a failing timer or task must not stop the other ones, nor the update handlers
+        timer_errors = []
+        if event_name == 'update' and event_args:
+            report = timer_errors.append if on_error is None else lambda e: on_error('timer', e)
+            self.scheduler.advance(event_args[0], report)
+
+        result = None
+        for event in self.handled_events.get(event_name, ()):
+            result = self.run_event_handler(event_name, event, event_args)
+        if timer_errors:
+            raise timer_errors[0]
+        return result
+
+    def run_event_handler(self, event_name, event, event_args):
         params = event['params']
         body = event['body']
         ctx = event['ctx']
 
-        param_names = [p.getText() for p in params.IDENTIFIER()] if params else []
+        param_names = event['param_names']
 
         if len(param_names) > len(event_args):
             raise InterpreterRuntimeError(f"Incorrect number of arguments for event handler '{event_name}'. Expected {len(param_names)}, got {len(event_args)}", ctx)
@@ -674,7 +911,8 @@ class CustomInterpreterVisitor(GrammarVisitor):
 
             self.visit(body)
         except ReturnValue as rv:
-            return rv.value
+            value, rv.value = rv.value, None
+            return value
         finally:
             self.exit_scope()
 
@@ -684,11 +922,14 @@ def get_range(left, right):
 def get_len(arr):
     return len(arr)
 
-def get_random_color():
-    r = random.randint(0, 255)
-    g = random.randint(0, 255)
-    b = random.randint(0, 255)
-    return r, g, b
+def map_has(m, key):
+    return key in m
+
+def map_keys(m):
+    return m.keys()
+
+def map_values(m):
+    return m.values()
 
 def get_sqrt(num):
     return math.sqrt(num)
@@ -696,43 +937,101 @@ def get_sqrt(num):
 def normalize(vec):
     return vec.normalized()
 
-def setup_builtin_functions(interpreter: CustomInterpreterVisitor, graphics_controller: GraphicsController):
+def setup_builtin_functions(interpreter: CustomInterpreterVisitor, graphics_controller: 'GraphicsController'):
     interpreter.add_builtin_function('print', builtin_print)
-    interpreter.add_builtin_function('draw', lambda point, shape: graphics_controller.draw_shape(point, shape))
+    interpreter.add_builtin_function('draw', lambda point, shape, layer=0: graphics_controller.draw_shape(point, shape, layer))
+    interpreter.add_builtin_function('remove', lambda target, *key: target.remove(*key) if isinstance(target, Map) else graphics_controller.remove_shape(target))
+    interpreter.add_builtin_function('clear_layer', graphics_controller.clear_layer)
     interpreter.add_builtin_function('push', lambda arr, value: arr.append(value))
     interpreter.add_builtin_function('range', get_range)
     interpreter.add_builtin_function('len', get_len)
-    interpreter.add_builtin_function('random_color', get_random_color)
+    interpreter.add_builtin_function('has', map_has)
+    interpreter.add_builtin_function('keys', map_keys)
+    interpreter.add_builtin_function('values', map_values)
     interpreter.add_builtin_function('sqrt', get_sqrt)
     interpreter.add_builtin_function('normalize', normalize)
     interpreter.add_builtin_function('get_mouse_pos', graphics_controller.get_mouse_pos)
     interpreter.add_builtin_function('get_window_width', graphics_controller.get_window_width)
     interpreter.add_builtin_function('get_window_height', graphics_controller.get_window_height)
-    interpreter.add_builtin_function('sin', math.sin)
+    interpreter.add_builtin_function('sin', noise.sin)
+    interpreter.add_builtin_function('cos', noise.cos)
+
+    generator = noise.Noise()
+    interpreter.add_builtin_function('random_color', generator.random_color)
+    interpreter.add_builtin_function('random', generator.random_float)
+    interpreter.add_builtin_function('random_int', generator.random_int)
+    interpreter.add_builtin_function('perlin', generator.perlin)
+    interpreter.add_builtin_function('simplex', generator.simplex)
+    interpreter.add_builtin_function('fbm', generator.fbm)
+
+    scheduler = interpreter.scheduler
+    interpreter.add_builtin_function('after', lambda seconds, proc: scheduler.after(seconds, interpreter.proc_callback(proc)))
+    interpreter.add_builtin_function('every', lambda seconds, proc: scheduler.every(seconds, interpreter.proc_callback(proc)))
+    interpreter.add_builtin_function('cancel', scheduler.cancel)
+    interpreter.add_builtin_function('spawn', interpreter.spawn)
+    interpreter.add_builtin_function('wait', scheduler.wait)
+
+    call = lambda proc, *args: interpreter.call_function(proc, list(args), None)
+    interpreter.add_builtin_function('sort', lambda arr, key=None: arraylib.sort(call, arr, key))
+    interpreter.add_builtin_function('filter_in_place', lambda arr, predicate: arraylib.filter_in_place(call, arr, predicate))
+    interpreter.add_builtin_function('slice', arraylib.slice_array)
+    interpreter.add_builtin_function('extend', arraylib.extend)
+    interpreter.add_builtin_function('pop', arraylib.pop)
+    interpreter.add_builtin_function('insert', arraylib.insert)
+    interpreter.add_builtin_function('remove_at', arraylib.remove_at)
+    interpreter.add_builtin_function('swap_remove', arraylib.swap_remove)
+    interpreter.add_builtin_function('index_of', arraylib.index_of)
+    interpreter.add_builtin_function('reverse', arraylib.reverse)
+    interpreter.add_builtin_function('fill', arraylib.fill)
+    interpreter.add_builtin_function('sum', arraylib.sum_array)
+    interpreter.add_builtin_function('min', arraylib.min_array)
+    interpreter.add_builtin_function('max', arraylib.max_array)
+    interpreter.add_builtin_function('argmin', arraylib.argmin)
+
+    interpreter.add_builtin_function('recompute_count', lambda: interpreter.bindings.recomputes_last_tick)
 
     interpreter.add_property('width', lambda width: graphics_controller.set_window_width(width))
     interpreter.add_property('height', lambda height: graphics_controller.set_window_height(height))
     interpreter.add_property('bg_color', lambda color: graphics_controller.set_background_color(color))
+    interpreter.add_property('seed', generator.seed)
 
-def run_file(filename: str):
-    print(f"Attempting to interpret file: {filename}")
-    try:
-        input_stream = FileStream(filename)
-        lexer = GrammarLexer(input_stream)
-        lexer.removeErrorListeners()
-        lexer.addErrorListener(BasicErrorListener())
+def parse_file(filename: str):
+    return _parse(FileStream(filename))
 
-        stream = CommonTokenStream(lexer)
-        parser = GrammarParser(stream)
-        parser.removeErrorListeners()
-        parser.addErrorListener(BasicErrorListener())
+def parse_source(source: str):
+    """Same as `parse_file`, for a script given as text."""
+    return _parse(InputStream(source))
 
-        tree = parser.program()
+def _parse(input_stream):
+    lexer = GrammarLexer(input_stream)
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(BasicErrorListener())
 
-        if parser.getNumberOfSyntaxErrors() == 0:
+    stream = CommonTokenStream(lexer)
+    parser = GrammarParser(stream)
+    parser.removeErrorListeners()
+    parser.addErrorListener(BasicErrorListener())
+
+    tree = parser.program()
+
+    if parser.getNumberOfSyntaxErrors() != 0:
+        return None
+    return tree
+
+def run_file(filename: str, low_alloc=False, remote=False, alloc_stats=False):
+    print(f"Attempting to interpret file: {filename}")
+    try:
+        tree = parse_file(filename)
+
+        if tree is not None:
             print("Parsing successful. Starting interpretation...")
+            if remote:
+                from remote import RemoteGraphicsController as GraphicsController
+            else:
+                from graphics import GraphicsController
+
             graphics_controller = GraphicsController([800, 800])
-            visitor = CustomInterpreterVisitor(graphics_controller)
+            visitor = CustomInterpreterVisitor(graphics_controller, low_alloc, alloc_stats)
             graphics_controller.add_visitor(visitor)
             setup_builtin_functions(visitor, graphics_controller)
 
@@ -741,6 +1040,13 @@ def run_file(filename: str):
             print("Interpretation complete. Waiting for graphics window to close...")
             graphics_controller.wait_for_display_close()
             print("Graphics window closed.")
+
+            print(visitor.events.summary())
+            if visitor.bindings.active:
+                print(visitor.bindings.summary())
+            if visitor.allocation_tracker:
+                print(visitor.allocation_tracker.summary())
+                visitor.allocation_tracker.release()
         else:
             print("Parsing failed. Halting execution.")
 
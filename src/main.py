@@ -2,8 +2,19 @@ from interpreter import run_file
 import sys
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <filename>")
+    args = sys.argv[1:]
+    low_alloc = "--low-alloc" in args
+    if low_alloc:
+        args.remove("--low-alloc")
+    remote = "--remote" in args
+    if remote:
+        args.remove("--remote")
+    alloc_stats = "--alloc-stats" in args
+    if alloc_stats:
+        args.remove("--alloc-stats")
+
+    if len(args) != 1:
+        print("Usage: python main.py [--low-alloc] [--remote] [--alloc-stats] <filename>")
         sys.exit(1)
 
-    run_file(sys.argv[1])
+    run_file(args[0], low_alloc, remote, alloc_stats)
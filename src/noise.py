@@ -0,0 +1,224 @@
+"""
+Procedural noise, trigonometry and seeded randomness.
+
+Every function taking coordinates accepts either numbers (`perlin(x, y)`), a point (`perlin(p)`),
+or arrays of them: `perlin(xs, ys)` with arrays of equal length, where a number in place of an
+array is used for every element, or `perlin(points)` with an array of points. Arrays are evaluated
+in a single builtin call and give an array of results, so a whole row of shapes costs one call
+instead of an interpreted loop.
+
+Noise is deterministic: the same seed always gives the same values. Without `set seed`, noise uses
+seed 0 and `random` is seeded by the operating system.
+"""
+import math
+import random as _random
+
+from values import Vec2
+
+# gradients of the 2D Perlin noise; the diagonal ones are not normalized, which keeps the output in [-1, 1]
+GRAD2 = ((1, 1), (-1, 1), (1, -1), (-1, -1), (1, 0), (-1, 0), (0, 1), (0, -1))
+# edge midpoints of a cube, the gradients of the 3D simplex noise
+GRAD3 = ((1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+         (1, 0, 1), (-1, 0, 1), (1, 0, -1), (-1, 0, -1),
+         (0, 1, 1), (0, -1, 1), (0, 1, -1), (0, -1, -1))
+
+F3 = 1 / 3
+G3 = 1 / 6
+
+def _split_points(args, extra):
+    """
+    Splits builtin arguments into (xs, ys, rest, is_array). `extra` is the number of arguments
+    following the coordinates that may also be arrays, like `t` of `simplex`.
+    """
+    if args and isinstance(args[0], (Vec2, list)) and (
+            isinstance(args[0], Vec2) or (args[0] and isinstance(args[0][0], Vec2))):
+        points, rest = args[0], list(args[1:])
+        if isinstance(points, Vec2):
+            return [points.x], [points.y], rest, False
+        return [p.x for p in points], [p.y for p in points], rest, True
+
+    if len(args) < 2:
+        raise TypeError("expected coordinates x, y or a point")
+    coordinates = list(args[:2 + extra])
+    rest = list(args[2 + extra:])
+
+    lengths = {len(value) for value in coordinates if isinstance(value, list)}
+    if len(lengths) > 1:
+        raise ValueError(f"coordinate arrays have different lengths: {sorted(lengths)}")
+    if not lengths:
+        return [coordinates[0]], [coordinates[1]], [[value] for value in coordinates[2:]] + rest, False
+
+    n = lengths.pop()
+    columns = [value if isinstance(value, list) else [value] * n for value in coordinates]
+    return columns[0], columns[1], columns[2:] + rest, True
+
+def _map_values(function, values):
+    if isinstance(values, list):
+        return [function(value) for value in values]
+    return function(values)
+
+def sin(x):
+    """Sine of a number, or of every element of an array."""
+    return _map_values(math.sin, x)
+
+def cos(x):
+    """Cosine of a number, or of every element of an array."""
+    return _map_values(math.cos, x)
+
+class Noise:
+    """Permutation table of the noise functions and the random generator, both derived from one seed."""
+
+    def __init__(self, seed=0):
+        self.random = _random.Random()
+        self._perm = self._perm12 = None
+        self._seed_noise(seed)
+
+    def _seed_noise(self, seed):
+        perm = list(range(256))
+        _random.Random(seed).shuffle(perm)
+        # doubled, so indices like perm[perm[x] + y + 1] never need wrapping
+        self._perm = perm * 2
+        self._perm12 = [value % 12 for value in self._perm]
+
+    def seed(self, seed):
+        self._seed_noise(seed)
+        self.random.seed(seed)
+
+    def random_float(self):
+        """Random number in [0, 1)."""
+        return self.random.random()
+
+    def random_int(self, low, high):
+        """Random integer in [low, high]."""
+        return self.random.randint(low, high)
+
+    def random_color(self):
+        return self.random.randint(0, 255), self.random.randint(0, 255), self.random.randint(0, 255)
+
+    def _perlin(self, x, y):
+        perm = self._perm
+        x0 = math.floor(x)
+        y0 = math.floor(y)
+        x -= x0
+        y -= y0
+        xi = x0 & 255
+        yi = y0 & 255
+
+        u = x * x * x * (x * (x * 6 - 15) + 10)
+        v = y * y * y * (y * (y * 6 - 15) + 10)
+
+        a = perm[xi] + yi
+        b = perm[xi + 1] + yi
+        gx, gy = GRAD2[perm[a] & 7]
+        n00 = gx * x + gy * y
+        gx, gy = GRAD2[perm[b] & 7]
+        n10 = gx * (x - 1) + gy * y
+        gx, gy = GRAD2[perm[a + 1] & 7]
+        n01 = gx * x + gy * (y - 1)
+        gx, gy = GRAD2[perm[b + 1] & 7]
+        n11 = gx * (x - 1) + gy * (y - 1)
+
+        bottom = n00 + u * (n10 - n00)
+        top = n01 + u * (n11 - n01)
+        return bottom + v * (top - bottom)
+
+    def _simplex(self, x, y, z):
+        perm = self._perm
+        perm12 = self._perm12
+
+        # skew into the simplex grid and find the cell
+        s = (x + y + z) * F3
+        i = math.floor(x + s)
+        j = math.floor(y + s)
+        k = math.floor(z + s)
+        t = (i + j + k) * G3
+        x0 = x - (i - t)
+        y0 = y - (j - t)
+        z0 = z - (k - t)
+
+        # which of the six tetrahedra of the cell contains the point
+        if x0 >= y0:
+            if y0 >= z0:
+                i1, j1, k1, i2, j2, k2 = 1, 0, 0, 1, 1, 0
+            elif x0 >= z0:
+                i1, j1, k1, i2, j2, k2 = 1, 0, 0, 1, 0, 1
+            else:
+                i1, j1, k1, i2, j2, k2 = 0, 0, 1, 1, 0, 1
+        else:
+            if y0 < z0:
+                i1, j1, k1, i2, j2, k2 = 0, 0, 1, 0, 1, 1
+            elif x0 < z0:
+                i1, j1, k1, i2, j2, k2 = 0, 1, 0, 0, 1, 1
+            else:
+                i1, j1, k1, i2, j2, k2 = 0, 1, 0, 1, 1, 0
+
+        corners = ((x0, y0, z0, 0, 0, 0),
+                   (x0 - i1 + G3, y0 - j1 + G3, z0 - k1 + G3, i1, j1, k1),
+                   (x0 - i2 + 2 * G3, y0 - j2 + 2 * G3, z0 - k2 + 2 * G3, i2, j2, k2),
+                   (x0 - 1 + 3 * G3, y0 - 1 + 3 * G3, z0 - 1 + 3 * G3, 1, 1, 1))
+
+        ii = i & 255
+        jj = j & 255
+        kk = k & 255
+        total = 0.0
+        for cx, cy, cz, di, dj, dk in corners:
+            falloff = 0.6 - cx * cx - cy * cy - cz * cz
+            if falloff > 0:
+                gx, gy, gz = GRAD3[perm12[ii + di + perm[jj + dj + perm[kk + dk]]]]
+                falloff *= falloff
+                total += falloff * falloff * (gx * cx + gy * cy + gz * cz)
+
+        # scales the result to [-1, 1]
+        return 32 * total
+
+    def _fbm(self, x, y, octaves, lacunarity, gain):
+        perlin = self._perlin
+        total = 0.0
+        amplitude = 1.0
+        amplitudes = 0.0
+        for _ in range(octaves):
+            total += amplitude * perlin(x, y)
+            amplitudes += amplitude
+            x *= lacunarity
+            y *= lacunarity
+            amplitude *= gain
+        return total / amplitudes
+
+    def perlin(self, *args):
+        """Perlin noise, in [-1, 1] and 0 at integer coordinates: perlin(x, y) or perlin(p)."""
+        xs, ys, _, is_array = _split_points(args, 0)
+        perlin = self._perlin
+        values = [perlin(x, y) for x, y in zip(xs, ys)]
+        return values if is_array else values[0]
+
+    def simplex(self, *args):
+        """3D simplex noise in [-1, 1], the third coordinate is usually time: simplex(x, y, t) or simplex(p, t)."""
+        xs, ys, rest, is_array = _split_points(args, 1)
+        if len(rest) != 1:
+            raise TypeError("simplex expects x, y and t, or a point and t")
+        ts = rest[0]
+        if not isinstance(ts, list):
+            ts = [ts] * len(xs)
+        elif len(ts) != len(xs):
+            raise ValueError(f"coordinate arrays have different lengths: {sorted({len(xs), len(ts)})}")
+
+        simplex = self._simplex
+        values = [simplex(x, y, t) for x, y, t in zip(xs, ys, ts)]
+        return values if is_array else values[0]
+
+    def fbm(self, *args):
+        """
+        Fractal Brownian motion: the sum of `octaves` layers of Perlin noise, each one `lacunarity` times
+        finer and `gain` times weaker than the previous one, scaled back to [-1, 1].
+        fbm(x, y, octaves=4, lacunarity=2, gain=0.5) or fbm(p, ...)
+        """
+        xs, ys, rest, is_array = _split_points(args, 0)
+        if len(rest) > 3:
+            raise TypeError(f"fbm expects at most 3 arguments after the coordinates, got {len(rest)}")
+        octaves, lacunarity, gain = rest + [4, 2, 0.5][len(rest):]
+        if not isinstance(octaves, int) or octaves < 1:
+            raise ValueError(f"fbm needs a positive whole number of octaves, got {octaves}")
+
+        fbm = self._fbm
+        values = [fbm(x, y, octaves, lacunarity, gain) for x, y in zip(xs, ys)]
+        return values if is_array else values[0]
@@ -0,0 +1,474 @@
+import collections
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+
+from values import Vec2
+from scene import Scene
+from events import report_event_error
+from shape import Shape, Rectangle, Circle, Triangle, Line, normalize_color
+
+# frames kept in the ring, the renderer always picks the newest complete one
+RING_SLOTS = 3
+MAX_SHAPES = 16384
+LATENCY_SAMPLES = 4096
+
+# latest published frame number
+RING_HEADER = struct.Struct('<Q')
+# frame number (0 while being written), tick start and publish time (monotonic ns),
+# layout generation, number of records, background colour
+SLOT_HEADER = struct.Struct('<QQQII4B4x')
+# kind, flags, layer, shape id, shape version, position, five kind specific parameters, colour
+RECORD = struct.Struct('<BBxxiQIfffffff4B')
+
+RECTANGLE, CIRCLE, TRIANGLE, LINE = range(1, 5)
+VISIBLE, STATIC = 1, 2
+
+SHAPE_KINDS = {Rectangle: RECTANGLE, Circle: CIRCLE, Triangle: TRIANGLE, Line: LINE}
+KIND_NAMES = {kind: shape_type.__name__ for shape_type, kind in SHAPE_KINDS.items()}
+
+def _hidden_record(kind, shape_id, version):
+    # stands in for a shape that can't be packed, so the records after it keep their indices
+    return kind, 0, 0, shape_id, version, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0
+
+def _shape_params(kind, shape):
+    if kind == RECTANGLE:
+        return shape.width, shape.height, 0, 0, 0
+    if kind == CIRCLE:
+        return shape.radius, 0, 0, 0, 0
+    if kind == TRIANGLE:
+        return shape.p2[0], shape.p2[1], shape.p3[0], shape.p3[1], 0
+    return shape.x2, shape.y2, shape.thickness, 0, 0
+
+def _apply_params(kind, shape, a, b, c, d, e):
+    if kind == RECTANGLE:
+        shape.width, shape.height = a, b
+    elif kind == CIRCLE:
+        shape.radius = a
+    elif kind == TRIANGLE:
+        shape.p2, shape.p3 = (a, b), (c, d)
+    else:
+        shape.x2, shape.y2, shape.thickness = a, b, c
+
+def _build_shape(kind):
+    if kind == RECTANGLE:
+        return Rectangle(0, 0, (0, 0, 0))
+    if kind == CIRCLE:
+        return Circle()
+    if kind == TRIANGLE:
+        return Triangle()
+    return Line()
+
+def ring_size(slots, max_shapes):
+    return RING_HEADER.size + slots * (SLOT_HEADER.size + max_shapes * RECORD.size)
+
+class FrameRing:
+    """
+    Ring of frame buffers in shared memory, written by the interpreter process and read by the renderer.
+
+    Each slot holds one frame: a header and a packed record per drawn shape, in drawing order.
+    A slot's frame number is zeroed while it is written and set last, so a reader copying a slot
+    can tell a complete frame from one the writer has lapped in the meantime.
+    """
+
+    def __init__(self, name=None, slots=RING_SLOTS, max_shapes=MAX_SHAPES):
+        self.slots = slots
+        self.max_shapes = max_shapes
+        self.slot_size = SLOT_HEADER.size + max_shapes * RECORD.size
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=ring_size(slots, max_shapes))
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.buffer = self.memory.buf
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def _slot_offset(self, frame):
+        return RING_HEADER.size + (frame % self.slots) * self.slot_size
+
+    def latest(self):
+        return RING_HEADER.unpack_from(self.buffer, 0)[0]
+
+    def write(self, frame, tick_ns, layout, records, background):
+        """
+        Writes a frame into its slot and publishes it. `records` is a list of RECORD tuples.
+        A record that can't be packed is written hidden instead; returns (index, error) of those.
+        """
+        offset = self._slot_offset(frame)
+        SLOT_HEADER.pack_into(self.buffer, offset, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+        start = record_offset = offset + SLOT_HEADER.size
+        pack_into = RECORD.pack_into
+        failed = []
+        for record in records:
+            try:
+                pack_into(self.buffer, record_offset, *record)
+            except (struct.error, OverflowError) as e:
+                # e.g. a non-numeric property, or a float out of float32 range
+                pack_into(self.buffer, record_offset, *_hidden_record(record[0], record[3], record[4]))
+                failed.append(((record_offset - start) // RECORD.size, e))
+            record_offset += RECORD.size
+
+        SLOT_HEADER.pack_into(self.buffer, offset, frame, tick_ns, time.monotonic_ns(), layout, len(records), *background)
+        RING_HEADER.pack_into(self.buffer, 0, frame)
+        return failed
+
+    def read(self, frame):
+        """Returns (header, records bytes) of the given frame, None if its slot was already overwritten."""
+        offset = self._slot_offset(frame)
+        header = SLOT_HEADER.unpack_from(self.buffer, offset)
+        if header[0] != frame:
+            return None
+
+        start = offset + SLOT_HEADER.size
+        data = bytes(self.buffer[start:start + header[4] * RECORD.size])
+        if SLOT_HEADER.unpack_from(self.buffer, offset)[0] != frame:
+            return None
+        return header, data
+
+    def close(self):
+        self.buffer = None
+        self.memory.close()
+
+    def unlink(self):
+        self.memory.unlink()
+
+class LatencyStats:
+    """Frame latencies in nanoseconds: running count, mean and maximum, percentiles over the latest samples."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.samples = collections.deque(maxlen=LATENCY_SAMPLES)
+
+    def add(self, latency_ns):
+        self.count += 1
+        self.total += latency_ns
+        self.max = max(self.max, latency_ns)
+        self.samples.append(latency_ns)
+
+    def percentile(self, p):
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self, label):
+        if not self.count:
+            return f"{label}: no frames drawn"
+        return (f"{label}: mean {self.total / self.count / 1e6:.2f} ms, p50 {self.percentile(50) / 1e6:.2f} ms, "
+                f"p95 {self.percentile(95) / 1e6:.2f} ms, max {self.max / 1e6:.2f} ms over {self.count} frames")
+
+class RemoteGraphicsController:
+    """
+    Graphics controller keeping the window in a separate process, so the interpreter and
+    the renderer don't compete for one GIL. It offers the same API as `GraphicsController`.
+
+    The interpreter process keeps the scene and runs the update loop in `wait_for_display_close`.
+    After every tick the scene is packed into a `FrameRing`; input events and the window size
+    come back over a pipe. Latency is measured from the start of a tick to the end of drawing
+    the frame it produced and printed when the window closes.
+    """
+
+    def __init__(self, window_size=(800, 600), fps=60, slots=RING_SLOTS, max_shapes=MAX_SHAPES):
+        self.window_size = tuple(window_size)
+        self.fps = fps
+        self.background_color = normalize_color((255, 255, 255))
+        self.scene = Scene()
+        self.layout = 0
+        self.mouse_pos = Vec2(0, 0)
+        self.frames = 0
+
+        self.ring = FrameRing(slots=slots, max_shapes=max_shapes)
+        self._renderer = None
+        self._connection = None
+        self._closed = False
+        self._overflow_reported = False
+        # (shape id, version) of shapes already reported as impossible to pack
+        self._reported_shapes = set()
+        self.latency = None
+
+        self.interpreter_visitor = None
+
+    def add_visitor(self, visitor):
+        self.interpreter_visitor = visitor
+
+    def start_display(self):
+        if self._renderer is not None:
+            return
+
+        context = multiprocessing.get_context('spawn')
+        self._connection, renderer_connection = context.Pipe()
+        self._renderer = context.Process(
+            target=run_renderer,
+            args=(self.ring.name, self.ring.slots, self.ring.max_shapes, self.window_size, self.fps, renderer_connection),
+            daemon=True)
+        self._renderer.start()
+        renderer_connection.close()
+
+    def _handle_events(self):
+        try:
+            while self._connection.poll():
+                message = self._connection.recv()
+                kind = message[0]
+
+                if kind == 'event':
+                    _, event_name, event_args, posted_ns = message
+                    if event_name in ('mousemove', 'drag'):
+                        self.mouse_pos = event_args[0]
+                    self.interpreter_visitor.events.post(event_name, event_args, posted_ns)
+                elif kind == 'resize':
+                    self.window_size = (message[1], message[2])
+                elif kind == 'stats':
+                    self.latency = message[1]
+                elif kind == 'closed':
+                    self._closed = True
+        except (EOFError, OSError):
+            self._closed = True
+
+    def _records(self):
+        records = []
+        for number in self.scene.layer_order:
+            for entry in self.scene.layers[number].entries():
+                shape = entry.shape
+                kind = SHAPE_KINDS.get(type(shape))
+                if kind is None:
+                    continue
+                version = shape._version & 0xFFFFFFFF
+                flags = (VISIBLE if shape.is_visible else 0) | (STATIC if shape.is_static else 0)
+                try:
+                    records.append((kind, flags, number, id(shape), version,
+                                    entry.point.x, entry.point.y, *_shape_params(kind, shape), *normalize_color(shape.color)))
+                except (AttributeError, TypeError, ValueError, IndexError, OverflowError) as e:
+                    self._report_shape_error(kind, id(shape), version, e)
+                    records.append(_hidden_record(kind, id(shape), version))
+
+        if len(records) > self.ring.max_shapes:
+            if not self._overflow_reported:
+                print(f"Warning: {len(records)} shapes drawn, only the first {self.ring.max_shapes} are rendered")
+                self._overflow_reported = True
+            del records[self.ring.max_shapes:]
+        return records
+
+    def _report_shape_error(self, kind, shape_id, version, error):
+        if (shape_id, version) in self._reported_shapes:
+            return
+        self._reported_shapes.add((shape_id, version))
+        print(f"Warning: {KIND_NAMES[kind]} can't be sent to the renderer and is not drawn: {error}")
+
+    def publish(self, tick_ns):
+        self.frames += 1
+        records = self._records()
+        failed = self.ring.write(self.frames, tick_ns, self.layout & 0xFFFFFFFF, records, self.background_color)
+        for index, error in failed:
+            record = records[index]
+            self._report_shape_error(record[0], record[3], record[4], error)
+
+    def wait_for_display_close(self):
+        if self._renderer is None:
+            return
+
+        frame_time = 1 / self.fps
+        last = time.perf_counter()
+        try:
+            while not self._closed and self._renderer.is_alive():
+                self._handle_events()
+
+                now = time.perf_counter()
+                tick_ns = time.monotonic_ns()
+                self.interpreter_visitor.process_events(now - last, report_event_error)
+                last = now
+                self.publish(tick_ns)
+
+                remaining = frame_time - (time.perf_counter() - now)
+                if remaining > 0:
+                    time.sleep(remaining)
+        finally:
+            # the shared memory segment and the pipe outlive the process unless released here
+            self._finish()
+
+    def _finish(self):
+        # after an error the window is still open; the renderer sends its statistics right before closing the pipe
+        self.kill_display()
+        self._renderer.join(timeout=2.0)
+        self._handle_events()
+        self._connection.close()
+        self.ring.close()
+        self.ring.unlink()
+        self._renderer = None
+
+        print(f"Remote renderer: {self.frames} frames published")
+        if self.latency is not None:
+            print(self.latency.summary("Frame latency (tick start to drawn)"))
+
+    def kill_display(self):
+        if self._renderer is not None and not self._closed:
+            try:
+                self._connection.send(('close',))
+            except (BrokenPipeError, OSError):
+                pass
+
+    def draw_shape(self, point, shape: Shape, layer=0):
+        self.scene.add(point, shape, layer)
+        self.layout += 1
+
+    def remove_shape(self, shape: Shape):
+        if self.scene.remove(shape):
+            self.layout += 1
+
+    def clear_layer(self, layer):
+        self.scene.clear_layer(layer)
+        self.layout += 1
+
+    def _send_window_size(self, width, height):
+        if self._renderer is not None:
+            self._connection.send(('set_window_size', width, height))
+
+    def set_window_width(self, width):
+        self._send_window_size(width, self.window_size[1])
+
+    def set_window_height(self, height):
+        self._send_window_size(self.window_size[0], height)
+
+    def get_window_width(self):
+        return self.window_size[0]
+
+    def get_window_height(self):
+        return self.window_size[1]
+
+    def get_mouse_pos(self):
+        return Vec2(self.mouse_pos.x, self.mouse_pos.y)
+
+    def set_background_color(self, color):
+        self.background_color = normalize_color(color)
+
+class RemoteSceneMirror:
+    """
+    Renderer side copy of the interpreter's scene, rebuilt from ring frames.
+
+    While the layout generation of the frames stays the same, shapes and points are updated
+    in place, and only when their record changed, so the static layer cache keeps working.
+    """
+
+    def __init__(self):
+        self.scene = Scene()
+        self.layout = None
+        self._points = []
+        self._shapes = {}
+
+    def apply(self, layout, data):
+        rebuild = layout != self.layout
+        if rebuild:
+            self.layout = layout
+            self.scene = Scene()
+            self._points = []
+            self._shapes = {}
+
+        for index, record in enumerate(RECORD.iter_unpack(data)):
+            kind, flags, layer, shape_id, version, x, y, a, b, c, d, e = record[:12]
+
+            known = self._shapes.get(shape_id)
+            if known is None or known[1] != version:
+                shape = known[0] if known is not None else _build_shape(kind)
+                _apply_params(kind, shape, a, b, c, d, e)
+                shape.color = record[12:]
+                shape.is_visible = bool(flags & VISIBLE)
+                shape.is_static = bool(flags & STATIC)
+                self._shapes[shape_id] = (shape, version)
+            else:
+                shape = known[0]
+
+            if rebuild:
+                point = Vec2(x, y)
+                self._points.append(point)
+                self.scene.add(point, shape, layer)
+            else:
+                point = self._points[index]
+                if point.x != x or point.y != y:
+                    point.x, point.y = x, y
+
+        if rebuild:
+            # cached static layers belong to the previous scene
+            for layer in self.scene.layers.values():
+                layer.static_dirty = True
+        return self.scene
+
+def run_renderer(ring_name, slots, max_shapes, window_size, fps, connection):
+    """Entry point of the renderer process."""
+    import arcade
+    from graphics import GameView, key_name
+
+    class RemoteView(GameView):
+        def __init__(self):
+            super().__init__(None, None)
+            self.ring = FrameRing(ring_name, slots, max_shapes)
+            self.mirror = RemoteSceneMirror()
+            self.frame = 0
+            self.tick_ns = None
+            self.latency = LatencyStats()
+
+        def on_update(self, delta_time):
+            while connection.poll():
+                message = connection.recv()
+                if message[0] == 'close':
+                    self.window.close()
+                    return
+                elif message[0] == 'set_window_size':
+                    self.window.set_size(int(message[1]), int(message[2]))
+
+        def post_event(self, event_name, event_args):
+            # merged and dispatched by the event queue of the interpreter process
+            connection.send(('event', event_name, event_args, time.monotonic_ns()))
+
+        def sync(self):
+            latest = self.ring.latest()
+            if latest == self.frame:
+                return
+            frame = self.ring.read(latest)
+            if frame is None:
+                return
+
+            header, data = frame
+            self.frame = latest
+            self.tick_ns = header[1]
+            self.background_color = header[5:9]
+            self.scene = self.mirror.apply(header[3], data)
+
+        def on_draw(self):
+            previous = self.frame
+            self.sync()
+            super().on_draw()
+            if self.frame != previous:
+                self.latency.add(time.monotonic_ns() - self.tick_ns)
+
+        def on_resize(self, width, height):
+            super().on_resize(width, height)
+            connection.send(('resize', width, height))
+
+        def on_key_press(self, key, modifiers):
+            self.post_event('keydown', [key_name(key), modifiers])
+            if key == arcade.key.ESCAPE:
+                print("ESC pressed, closing the window...")
+                self.window.close()
+
+    view = None
+    try:
+        width, height = window_size
+        window = arcade.Window(width, height, "MIASI-lang interpreter", resizable=True,
+                               update_rate=1 / fps, draw_rate=1 / fps)
+        view = RemoteView()
+        window.show_view(view)
+        arcade.run()
+    except Exception as e:
+        print(f"Error in renderer process: {e}")
+    finally:
+        try:
+            if view is not None:
+                connection.send(('stats', view.latency))
+                view.ring.close()
+            connection.send(('closed',))
+        except (BrokenPipeError, OSError):
+            pass
+        connection.close()
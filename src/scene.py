@@ -0,0 +1,267 @@
+import collections
+import itertools
+
+from values import Vec2
+
+
+class DrawnVec2(Vec2):
+    """
+    Class of a point once it is drawn. Its layout is the one of Vec2, so `Scene.add` switches
+    the class of the point in place; writes to the point then mark the entries drawing it,
+    while points that are never drawn pay nothing.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        # only the position is drawn, other properties scripts add to a point don't matter
+        changed = (name == 'x' or name == 'y') and getattr(self, name) != value
+        object.__setattr__(self, name, value)
+        if changed:
+            for entry in tuple(self._entries):
+                entry.touch()
+
+
+class SceneEntry:
+    """
+    A shape drawn at a point. The shape and the point know their entries and `touch` them
+    on every write, so finding what changed in a frame doesn't need a look at every entry.
+
+    Writes come from the interpreter thread while the render thread refreshes the scene:
+    a touch only sets a flag or appends to a deque, both safe to do concurrently.
+    """
+    __slots__ = ('point', 'shape', 'layer', 'handle', 'static', 'touched', 'still_frames')
+
+    def __init__(self, point, shape, layer, handle):
+        self.point = point
+        self.shape = shape
+        self.layer = layer
+        self.handle = handle
+        self.static = False
+        self.touched = False
+        self.still_frames = 0
+
+        shape.__dict__.setdefault('_entries', {})[self] = None
+        if not isinstance(point, DrawnVec2):
+            point._entries = {}
+            point.__class__ = DrawnVec2
+        point._entries[self] = None
+
+    def touch(self):
+        if self.static:
+            self.layer.touched.append(self)
+        else:
+            self.touched = True
+
+    def detach(self):
+        self.shape._entries.pop(self, None)
+        self.point._entries.pop(self, None)
+
+
+class Layer:
+    """
+    Entries of a single layer. Entries considered static are kept apart from the
+    dynamic ones, so the renderer can cache them; `static_dirty` is set whenever the
+    static part has to be rendered again. `touched` queues the static entries changed
+    since the last `Scene.refresh_static`; ones removed or demoted meanwhile are skipped there.
+    """
+
+    def __init__(self):
+        self.dynamic: dict[int, SceneEntry] = {}
+        self.static: dict[int, SceneEntry] = {}
+        self.touched: collections.deque[SceneEntry] = collections.deque()
+        self.static_dirty = False
+
+    def __len__(self):
+        return len(self.dynamic) + len(self.static)
+
+    def pop(self, handle):
+        if handle in self.static:
+            self.static_dirty = True
+            entry = self.static.pop(handle)
+        else:
+            entry = self.dynamic.pop(handle, None)
+        if entry is not None:
+            entry.detach()
+        return entry
+
+    def clear(self):
+        if self.static:
+            self.static_dirty = True
+        for entry in self.entries():
+            entry.detach()
+        self.dynamic.clear()
+        self.static.clear()
+        self.touched.clear()
+
+    def entries(self):
+        yield from self.static.values()
+        yield from self.dynamic.values()
+
+
+def _culled(entry, left, bottom, right, top):
+    if not entry.shape.is_visible:
+        return True
+
+    bounds = entry.shape.bounds(entry.point.x, entry.point.y)
+    if bounds is None:
+        return False
+
+    s_left, s_bottom, s_right, s_top = bounds
+    return s_right < left or s_left > right or s_top < bottom or s_bottom > top
+
+
+class Scene:
+    """
+    Z-ordered set of drawn shapes.
+
+    Every `draw` call creates an entry `(point, shape)` inside a layer. Layers are
+    drawn from the lowest to the highest number, entries inside a layer in the order
+    they were added. Entries are kept in dicts keyed by a handle, so removing a shape
+    costs O(number of times it was drawn) instead of a scan over the whole scene.
+
+    Entries of shapes marked with `is_static`, or left unchanged for a number of
+    frames, are moved to the static part of their layer (see `refresh_static`).
+    Static entries are drawn below the dynamic ones of the same layer, so an entry
+    is only moved there automatically when that keeps the order it was added in.
+    """
+
+    def __init__(self):
+        self.layers: dict[int, Layer] = {}
+        self.layer_order: list[int] = []
+        self._handles_by_shape: dict[int, list[tuple[int, int]]] = {}
+        self._next_handle = itertools.count()
+
+    def __len__(self):
+        return sum(len(layer) for layer in self.layers.values())
+
+    def add(self, point, shape, layer=0):
+        layer = int(layer)
+        entries = self.layers.get(layer)
+        if entries is None:
+            entries = self.layers[layer] = Layer()
+            self.layer_order = sorted(self.layers)
+
+        handle = next(self._next_handle)
+        entries.dynamic[handle] = SceneEntry(point, shape, entries, handle)
+        self._handles_by_shape.setdefault(id(shape), []).append((layer, handle))
+        return handle
+
+    def remove(self, shape):
+        handles = self._handles_by_shape.pop(id(shape), None)
+        if handles is None:
+            return False
+
+        for layer, handle in handles:
+            self.layers[layer].pop(handle)
+        return True
+
+    def clear_layer(self, layer):
+        layer = int(layer)
+        entries = self.layers.get(layer)
+        if not entries:
+            return
+
+        for handle, entry in itertools.chain(entries.static.items(), entries.dynamic.items()):
+            handles = self._handles_by_shape.get(id(entry.shape))
+            if handles is None:
+                continue
+            handles.remove((layer, handle))
+            if not handles:
+                del self._handles_by_shape[id(entry.shape)]
+        entries.clear()
+
+    def clear(self):
+        for layer in self.layers.values():
+            layer.clear()
+        self._handles_by_shape.clear()
+
+    def entries(self):
+        """Yields every (point, shape) pair in drawing order, without any culling."""
+        for layer in self.layer_order:
+            for entry in self.layers[layer].entries():
+                yield entry.point, entry.shape
+
+    def visible(self, left, bottom, right, top):
+        """
+        Yields (point, shape) pairs that should be drawn in the given viewport,
+        in drawing order. Hidden shapes and shapes whose bounds lie entirely outside
+        the viewport are skipped. Shapes without bounds are never culled.
+        """
+        for layer in self.layer_order:
+            for entry in self.layers[layer].entries():
+                if not _culled(entry, left, bottom, right, top):
+                    yield entry.point, entry.shape
+
+    def visible_in(self, entries, left, bottom, right, top):
+        """Same as `visible`, restricted to the given entries of a single layer."""
+        for entry in entries.values():
+            if not _culled(entry, left, bottom, right, top):
+                yield entry.point, entry.shape
+
+    def refresh_static(self, static_after=0):
+        """
+        Moves entries between the static and dynamic parts of their layers.
+        Meant to be called once per frame. Static entries are only looked at when
+        they were touched, so the cost grows with the number of dynamic entries.
+
+        A dynamic entry becomes static when its shape has `is_static` set, or when
+        `static_after` > 0, neither the shape nor its point changed for that many
+        frames and every entry added before it in its layer is static as well.
+        A static entry that changed goes back to the dynamic part, unless its shape
+        is explicitly static - then only the layer is marked dirty. Entries added
+        after a demoted one go back with it, so the order of drawing is kept.
+
+        Returns the numbers of layers whose static part has to be rendered again.
+        """
+        dirty = []
+        for number in self.layer_order:
+            layer = self.layers[number]
+
+            demoted = []
+            touched = layer.touched
+            while touched:
+                entry = touched.popleft()
+                if layer.static.get(entry.handle) is not entry:
+                    # demoted while the touch was queued, or removed
+                    entry.touched = True
+                    continue
+                layer.static_dirty = True
+                if not entry.shape.is_static:
+                    demoted.append(entry.handle)
+            if demoted:
+                first = min(demoted)
+                demoted = [handle for handle, entry in layer.static.items()
+                           if handle >= first and not entry.shape.is_static]
+            if demoted:
+                for handle in demoted:
+                    entry = layer.dynamic[handle] = layer.static.pop(handle)
+                    entry.static = False
+                    entry.still_frames = 0
+                # dynamic entries are drawn in dict order, the demoted ones belong before the newer ones
+                ordered = sorted(layer.dynamic.items())
+                layer.dynamic.clear()
+                layer.dynamic.update(ordered)
+
+            promoted = []
+            # the first dynamic entry that stays, only entries added before it can be cached
+            blocking = None
+            for handle, entry in layer.dynamic.items():
+                if entry.touched:
+                    entry.touched = False
+                    entry.still_frames = 0
+                else:
+                    entry.still_frames += 1
+
+                if entry.shape.is_static or 0 < static_after <= entry.still_frames:
+                    promoted.append(handle)
+                elif blocking is None or handle < blocking:
+                    blocking = handle
+            for handle in promoted:
+                if blocking is None or handle < blocking or layer.dynamic[handle].shape.is_static:
+                    entry = layer.static[handle] = layer.dynamic.pop(handle)
+                    entry.static = True
+                    layer.static_dirty = True
+
+            if layer.static_dirty:
+                dirty.append(number)
+        return dirty
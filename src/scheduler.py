@@ -0,0 +1,227 @@
+import ctypes
+import heapq
+import itertools
+import threading
+
+class TaskCancelled(BaseException):
+    # raised inside a cancelled task to unwind it; not an Exception, so nothing in the interpreter catches it
+    pass
+
+class Task:
+    """
+    A proc that can suspend itself in the middle of its body.
+
+    The interpreter is a recursive tree walker, so a running proc can't be suspended
+    by a generator. Each task gets its own thread instead, but control is handed
+    over strictly: the scheduler blocks in `step` until the task waits or finishes,
+    and the task blocks in `pause` until the scheduler steps it again. Only one of
+    them runs at any time.
+    """
+
+    def __init__(self, run, context=None):
+        self.context = context
+        self.done = False
+        self.cancelled = False
+        self.error = None
+        self._running = False
+        self._resume = threading.Semaphore(0)
+        self._paused = threading.Semaphore(0)
+        self._thread = threading.Thread(target=self._main, args=(run,), daemon=True)
+        self._thread.start()
+
+    def _main(self, run):
+        self._resume.acquire()
+        self._running = True
+        try:
+            if not self.cancelled:
+                run()
+        except TaskCancelled:
+            pass
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._running = False
+            self.done = True
+            self._paused.release()
+
+    def step(self):
+        self._resume.release()
+        self._paused.acquire()
+
+    def pause(self):
+        self._running = False
+        self._paused.release()
+        self._resume.acquire()
+        self._running = True
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def stop(self, timeout=1.0):
+        """
+        Cancels the task from outside and waits for its thread to end. A task still running,
+        because the scheduler was interrupted while stepping it (e.g. by a timeout), gets
+        TaskCancelled raised asynchronously in its thread; a paused one is woken up to unwind.
+        """
+        self.cancelled = True
+        if self.done:
+            return
+        if self._running:
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self._thread.ident), ctypes.py_object(TaskCancelled))
+        self._resume.release()
+        self._thread.join(timeout)
+
+class _Entry:
+    __slots__ = ('id', 'callback', 'interval', 'task', 'due', 'order', 'cancelled')
+
+    def __init__(self, entry_id, callback=None, interval=None, task=None):
+        self.id = entry_id
+        self.callback = callback
+        self.interval = interval
+        self.task = task
+        self.due = 0.0
+        self.order = 0
+        self.cancelled = False
+
+class Scheduler:
+    """
+    Timers and waiting tasks, kept in a heap ordered by due time.
+
+    Time only moves forward in `advance`, by the `dt` of each update tick, so every tick
+    costs O(log n) per due timer and nothing for the ones still waiting. Cancelled entries
+    stay in the heap and are dropped when they reach its top.
+
+    `switch_context` is called with a task's context before it runs and with the previous
+    context afterwards; the interpreter uses it to give each task its own scope stack.
+    """
+
+    def __init__(self, switch_context=None):
+        self.time = 0.0
+        self.current = None
+        self._heap = []
+        self._entries: dict[int, _Entry] = {}
+        self._ids = itertools.count(1)
+        self._order = itertools.count()
+        self._switch_context = switch_context
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _push(self, entry, due):
+        entry.due = due
+        entry.order = next(self._order)
+        heapq.heappush(self._heap, (due, entry.order, entry))
+
+    def _add(self, entry, due):
+        self._entries[entry.id] = entry
+        self._push(entry, due)
+        return entry.id
+
+    def after(self, delay, callback):
+        return self._add(_Entry(next(self._ids), callback), self.time + delay)
+
+    def every(self, interval, callback):
+        if interval <= 0:
+            raise ValueError(f"Timer interval must be positive, got {interval}")
+        return self._add(_Entry(next(self._ids), callback, interval), self.time + interval)
+
+    def spawn(self, run, context=None):
+        """Starts a task and runs it until it waits for the first time or finishes."""
+        entry = _Entry(next(self._ids), task=Task(run, context))
+        self._entries[entry.id] = entry
+        self._step(entry)
+        return entry.id
+
+    def wait(self, seconds):
+        """Suspends the running task for the given time, called from inside the task."""
+        entry = self.current
+        if entry is None:
+            raise RuntimeError("wait() can only be used inside a spawned proc")
+
+        self._push(entry, self.time + max(0, seconds))
+        entry.task.pause()
+
+    def cancel(self, entry_id):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return False
+
+        entry.cancelled = True
+        if entry.task is not None:
+            entry.task.cancelled = True
+            if entry is self.current:
+                raise TaskCancelled()
+            # let the task unwind, so its thread ends
+            self._step(entry)
+        return True
+
+    def _step(self, entry):
+        task = entry.task
+        previous_entry, self.current = self.current, entry
+        previous_context = self._switch_context(task.context) if self._switch_context else None
+        try:
+            task.step()
+        finally:
+            if self._switch_context:
+                self._switch_context(previous_context)
+            self.current = previous_entry
+
+        if task.done:
+            entry.cancelled = True
+            self._entries.pop(entry.id, None)
+            if task.error is not None:
+                raise task.error
+
+    def advance(self, delta_time, on_error=None):
+        """
+        Moves the clock forward and runs every timer and task that became due.
+        An error of one of them is passed to `on_error(error)` if given, and the remaining
+        ones still run; otherwise it is raised.
+        """
+        self.time += delta_time
+        if not self._heap or self._heap[0][0] > self.time:
+            return
+
+        # one-shot timers and waits scheduled while advancing run on the next tick at the
+        # earliest, otherwise wait(0) in a loop would never let the tick end
+        limit = next(self._order)
+        deferred = []
+        try:
+            while self._heap and self._heap[0][0] <= self.time:
+                item = heapq.heappop(self._heap)
+                due, order, entry = item
+                if entry.cancelled or entry.order != order:
+                    continue
+                if order > limit and entry.interval is None:
+                    deferred.append(item)
+                    continue
+
+                try:
+                    if entry.task is not None:
+                        self._step(entry)
+                    elif entry.interval is not None:
+                        # repeating timers catch up when dt is longer than their interval
+                        self._push(entry, due + entry.interval)
+                        entry.callback()
+                    else:
+                        entry.cancelled = True
+                        del self._entries[entry.id]
+                        entry.callback()
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(e)
+        finally:
+            # an error in a callback or task must not lose what was deferred to the next tick
+            for item in deferred:
+                heapq.heappush(self._heap, item)
+
+    def close(self):
+        """Cancels every timer and stops every task, so no task thread outlives the script."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        self._heap.clear()
+        self.current = None
+        for entry in entries:
+            entry.cancelled = True
+            if entry.task is not None:
+                entry.task.stop()
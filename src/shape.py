@@ -1,24 +1,70 @@
-import arcade
+# arcade is bound by load_arcade() when a window backend starts, so shapes can be created,
+# inspected and simulated without importing it
+arcade = None
+
+def load_arcade():
+    global arcade
+    if arcade is None:
+        import arcade as arcade_module
+        arcade = arcade_module
+    return arcade
+
+# normalized colours are shared between shapes, keyed by the colour they were created with
+_normalized_colors = {}
+NORMALIZED_COLOR_LIMIT = 4096
+
+def normalize_color(color):
+    key = tuple(color) if isinstance(color, list) else color
+    try:
+        normalized = _normalized_colors.get(key)
+    except TypeError:
+        normalized = None
+    if normalized is not None:
+        return normalized
+
+    if isinstance(color, (list, tuple)) and len(color) == 4:
+        normalized = tuple(int(max(0, min(255, c))) for c in color)
+    elif isinstance(color, (list, tuple)) and len(color) == 3:
+        normalized = (int(max(0, min(255, color[0]))),
+                      int(max(0, min(255, color[1]))),
+                      int(max(0, min(255, color[2]))),
+                      255) # Add default alpha
+    else:
+        print(f"Warning: Invalid color value '{color}'. Using default black.")
+        return 0, 0, 0, 255
+
+    if len(_normalized_colors) >= NORMALIZED_COLOR_LIMIT:
+        _normalized_colors.clear()
+    _normalized_colors[key] = normalized
+    return normalized
 
 class Shape:
     def __init__(self, properties, color=(0, 0, 0, 255)):
         self.is_visible = True
+        self.is_static = False
         for prop in properties:
             setattr(self, prop, properties[prop])
-        if isinstance(color, (list, tuple)) and len(color) == 4:
-            self.color = tuple(int(max(0, min(255, c))) for c in color)
-        elif isinstance(color, (list, tuple)) and len(color) == 3:
-            self.color = (int(max(0, min(255, color[0]))),
-                          int(max(0, min(255, color[1]))),
-                          int(max(0, min(255, color[2]))),
-                          255) # Add default alpha
-        else:
-             print(f"Warning: Invalid color value '{color}'. Using default black.")
-             self.color = (0, 0, 0, 255)
+        self.color = normalize_color(color)
+
+    def __setattr__(self, name, value):
+        # every property change bumps the version and marks the scene entries drawing the shape,
+        # so renderer caches know when to redraw
+        attributes = self.__dict__
+        attributes[name] = value
+        attributes['_version'] = attributes.get('_version', 0) + 1
+        entries = attributes.get('_entries')
+        if entries:
+            # the render thread may add entries meanwhile, so iterate over a copy
+            for entry in tuple(entries):
+                entry.touch()
 
     def draw(self,x,y):
         pass
 
+    def bounds(self, x, y):
+        # (left, bottom, right, top) of the shape drawn at (x, y), None if unknown
+        return None
+
 class Rectangle(Shape):
     def __init__(self, width, height, color, **kwargs):
         super().__init__(kwargs, color)
@@ -34,6 +80,11 @@ class Rectangle(Shape):
         )
         arcade.draw_rect_filled(rect, self.color)
 
+    def bounds(self, x, y):
+        half_w = self.width / 2
+        half_h = self.height / 2
+        return x - half_w, y - half_h, x + half_w, y + half_h
+
 class Circle(Shape):
     def __init__(self, radius=10, color=(0, 0, 0, 255), **kwargs):
         super().__init__(kwargs, color)
@@ -42,6 +93,10 @@ class Circle(Shape):
     def draw(self,x,y):
         arcade.draw_circle_filled(x, y, self.radius, self.color)
 
+    def bounds(self, x, y):
+        r = self.radius
+        return x - r, y - r, x + r, y + r
+
 class Triangle(Shape):
     def __init__(self, p2=(10,0), p3=(5,10), color=(0, 0, 0, 255), **kwargs):
         super().__init__(kwargs, color)
@@ -57,6 +112,11 @@ class Triangle(Shape):
             self.color
         )
 
+    def bounds(self, x, y):
+        xs = (x, self.p2[0], self.p3[0])
+        ys = (y, self.p2[1], self.p3[1])
+        return min(xs), min(ys), max(xs), max(ys)
+
 
 class Line(Shape):
      def __init__(self, x2=10, y2=10, thickness=1, color=(0, 0, 0, 255), **kwargs):
@@ -66,4 +126,9 @@ class Line(Shape):
          self.thickness = thickness
 
      def draw(self, x, y):
-         arcade.draw_line(x, y, self.x2, self.y2, self.color, self.thickness)
\ No newline at end of file
+         arcade.draw_line(x, y, self.x2, self.y2, self.color, self.thickness)
+
+     def bounds(self, x, y):
+         pad = self.thickness / 2
+         return (min(x, self.x2) - pad, min(y, self.y2) - pad,
+                 max(x, self.x2) + pad, max(y, self.y2) + pad)
\ No newline at end of file
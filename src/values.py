@@ -0,0 +1,70 @@
+import math
+
+class Vec2:
+    # `_entries` is only set on drawn points, see scene.DrawnVec2; scripts may add their
+    # own properties to points, the `__dict__` holding them is created on the first one
+    __slots__ = ('x', 'y', '_entries', '__dict__')
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def length(self):
+        return math.sqrt(self.x**2 + self.y**2)
+
+    def __str__(self):
+        return f"({self.x}, {self.y})"
+
+    def normalized(self):
+        length = self.length()
+        if length == 0:
+            return Vec2(0, 0)
+        return Vec2(self.x / length, self.y / length)
+
+
+class Map:
+    """
+    Hash map of the language. Keys can be any hashable value (numbers, strings, colours, shapes)
+    and Vec2, which is keyed by its coordinates: a copy of the point is stored on insertion,
+    so later changes to the original point don't affect the map.
+    """
+    __slots__ = ('_entries',)
+
+    def __init__(self):
+        # normalized key -> (key, value)
+        self._entries = {}
+
+    @staticmethod
+    def _normalize(key):
+        if isinstance(key, Vec2):
+            return Vec2, key.x, key.y
+        return key
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self._normalize(key) in self._entries
+
+    def __getitem__(self, key):
+        return self._entries[self._normalize(key)][1]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, Vec2):
+            key = Vec2(key.x, key.y)
+        self._entries[self._normalize(key)] = (key, value)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def remove(self, key):
+        return self._entries.pop(self._normalize(key))[1]
+
+    def keys(self):
+        return [Vec2(key.x, key.y) if isinstance(key, Vec2) else key for key, _ in self._entries.values()]
+
+    def values(self):
+        return [value for _, value in self._entries.values()]
+
+    def __str__(self):
+        return "Map{" + ", ".join(f"{key}: {value}" for key, value in self._entries.values()) + "}"